@@ -0,0 +1,59 @@
+"""Admin helpers shared by the apps."""
+
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.forms.models import BaseInlineFormSet
+from django.http import QueryDict
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    """Represent an inline formset that only shows a single page of existing objects."""
+
+    per_page = 25
+    page_param = "page"
+    page_number: int | str = 1
+    query_params: QueryDict = QueryDict()
+
+    def get_queryset(self):
+        """Return only the existing objects of the requested page."""
+        if not hasattr(self, "page"):
+            self.page = Paginator(super().get_queryset(), self.per_page).get_page(self.page_number)
+            self._queryset = self.page.object_list
+        return self._queryset
+
+    @property
+    def previous_page_query(self):
+        """Return the query string of the previous page, keeping all other parameters."""
+        return self._get_page_query(self.page.previous_page_number())
+
+    @property
+    def next_page_query(self):
+        """Return the query string of the next page, keeping all other parameters."""
+        return self._get_page_query(self.page.next_page_number())
+
+    def _get_page_query(self, page_number: int):
+        query = self.query_params.copy()
+        query[self.page_param] = str(page_number)
+        return f"?{query.urlencode()}"
+
+
+class PaginatedTabularInline(admin.TabularInline):
+    """Represent a tabular inline that paginates its existing objects.
+
+    The page is selected through a query parameter named after the formset prefix (eg. `bankaccount_set-page`), so
+    multiple paginated inlines can coexist on one change form. The page links keep the other query parameters, such as
+    the changelist filters and the pages of the other inlines.
+    """
+
+    formset = PaginatedInlineFormSet
+    template = "admin/edit_inline/tabular_paginated.html"
+    per_page = 25
+
+    def get_formset(self, request, obj=None, **kwargs):
+        """Configure the formset with the page requested for this inline."""
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.per_page = self.per_page
+        formset.page_param = f"{formset.get_default_prefix()}-page"
+        formset.page_number = request.GET.get(formset.page_param, 1)
+        formset.query_params = request.GET
+        return formset
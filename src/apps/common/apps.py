@@ -0,0 +1,10 @@
+"""Common app configuration."""
+
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    """Represent the common AppConfig."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.common"
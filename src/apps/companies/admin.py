@@ -2,11 +2,12 @@
 
 from django.contrib import admin
 
+from apps.common.admin import PaginatedTabularInline
 from apps.companies.models import BankAccount, Company
 from apps.geo.admin import AddressInline
 
 
-class BankAccountInline(admin.TabularInline):
+class BankAccountInline(PaginatedTabularInline):
     """Represent the Bank Account inline to add/remove bank accounts."""
 
     model = BankAccount
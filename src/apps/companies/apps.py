@@ -1,6 +1,8 @@
 """Companies app configuration."""
 
 from django.apps import AppConfig
+from django.conf import settings
+from django.utils import translation
 
 
 class CompaniesConfig(AppConfig):
@@ -8,3 +10,15 @@ class CompaniesConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.companies"
+
+    def ready(self):
+        """Load the translation catalogs of all configured languages.
+
+        The catalogs are process-wide and otherwise loaded on the first request that activates a language.
+        Resolving the VAT label once per language moves that work to startup.
+        """
+        from apps.companies.models import VAT_LABEL
+
+        for language_code, _language_name in settings.LANGUAGES:
+            with translation.override(language_code):
+                str(VAT_LABEL)
@@ -6,6 +6,9 @@ from typing import TYPE_CHECKING
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+NON_ALPHANUMERIC_RE = re.compile(r"[^a-zA-Z0-9]+")
+VAT_LABEL = _("VAT")
+
 
 class Company(models.Model):
     """Represent a company."""
@@ -49,20 +52,15 @@ class Company(models.Model):
 
     def get_vat_number_display(self):
         """Return the VAT number for display."""
-        vat_str = _("VAT")
-        return f"{vat_str} {self.vat_number}"
+        return f"{VAT_LABEL} {self.vat_number}"
 
     def get_name_cleaned(self):
         """Return the cleaned name.
 
-        All non-alphanumeric characters are replaced with an underscore and consecutive underscore are replaced by a
-        single underscore.
+        Every run of non-alphanumeric characters is replaced by a single underscore.
         The final result is stripped of leading and trailing underscores and lowercased.
         """
-        cleaned_name = re.sub(r"[^a-zA-Z0-9]", "_", self.name)
-        cleaned_name = re.sub(r"__+", "_", cleaned_name)
-        cleaned_name = cleaned_name.strip("_")
-        return cleaned_name.lower()
+        return NON_ALPHANUMERIC_RE.sub("_", self.name).strip("_").lower()
 
     class Meta:
         """Add a correct plural name."""
@@ -71,6 +69,14 @@ class Company(models.Model):
         verbose_name_plural = _("companies")
 
 
+class BankAccountQuerySet(models.QuerySet["BankAccount"]):
+    """Represent a queryset of bank accounts."""
+
+    def with_owner(self):
+        """Load the company of the bank accounts, for callers that read it per bank account."""
+        return self.select_related("company")
+
+
 class BankAccount(models.Model):
     """Represent a bank account."""
 
@@ -79,6 +85,8 @@ class BankAccount(models.Model):
     name = models.CharField(verbose_name=_("name"), max_length=255, blank=True, default="")
     company = models.ForeignKey(Company, on_delete=models.CASCADE, verbose_name=_("company"))
 
+    objects = BankAccountQuerySet.as_manager()
+
     def __str__(self):
         """Return the string representation of the bank account."""
         return f"{self.name} {self.iban}"
@@ -1,6 +1,10 @@
 """Companies app tests."""
 
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
 from apps.companies.models import BankAccount, Company
 
@@ -34,6 +38,12 @@ class CompanyTests(TestCase):
         self.assertTrue(hasattr(self.company, "project_set"))
         self.assertTrue(hasattr(self.company, "user_set"))
 
+    def test_bank_account_company_is_loaded(self):
+        """Test that bank accounts are loaded together with their company."""
+        with self.assertNumQueries(1):
+            bank_account = BankAccount.objects.with_owner().get(pk=1)
+            self.assertEqual(bank_account.company.name, "IDA Inc.")
+
     def test_get_vat_number_display(self):
         """Test the get_vat_number_display method."""
         self.assertEqual(self.company.get_vat_number_display(), "VAT BE0123456789")
@@ -41,8 +51,62 @@ class CompanyTests(TestCase):
     def test_get_name_cleaned(self):
         """Test the get_name_cleaned method."""
         self.assertEqual(self.company.get_name_cleaned(), "ida_inc")
+        self.assertEqual(Company(name="__IDA -- Inc. & Co.__").get_name_cleaned(), "ida_inc_co")
+        self.company.name = "IDA Group"
+        self.assertEqual(self.company.get_name_cleaned(), "ida_group")
 
     def test_str(self):
         """Test the string representation."""
         self.assertEqual(str(self.company), "IDA Inc.")
         self.assertEqual(str(self.bank_account), "ING BE68539007547034")
+
+
+class CompanyAdminTests(TestCase):
+    """Company admin tests."""
+
+    fixtures = ["companies"]
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up the test data."""
+        cls.company = Company.objects.get(pk=1)
+        BankAccount.objects.bulk_create(
+            BankAccount(iban=f"BE{i:014d}", name=f"Bank {i}", company=cls.company) for i in range(30)
+        )
+        cls.admin_user = get_user_model().objects.create_superuser(username="admin", password="testpass1234")
+        cls.change_url = reverse("admin:companies_company_change", args=[cls.company.pk])
+
+    def setUp(self):
+        """Log in as the admin user."""
+        self.client.force_login(self.admin_user)
+
+    def get_bank_account_formset(self, response):
+        """Return the bank account formset from the change form response."""
+        return next(
+            inline.formset
+            for inline in response.context["inline_admin_formsets"]
+            if inline.formset.model is BankAccount
+        )
+
+    def test_bank_account_inline_pagination(self):
+        """Test that the bank account inline only loads a single page of bank accounts."""
+        formset = self.get_bank_account_formset(self.client.get(self.change_url))
+        self.assertEqual(formset.initial_form_count(), 25)
+        self.assertEqual(formset.page.paginator.count, 31)
+
+        formset = self.get_bank_account_formset(self.client.get(self.change_url, {"bankaccount_set-page": 2}))
+        self.assertEqual(formset.initial_form_count(), 6)
+
+    def test_bank_account_inline_page_links_keep_query(self):
+        """Test that the page links of the bank account inline keep the other query parameters."""
+        response = self.client.get(self.change_url, {"_changelist_filters": "q=ida"})
+        self.assertContains(response, 'href="?_changelist_filters=q%3Dida&amp;bankaccount_set-page=2"')
+
+    def test_changelist_queries_do_not_grow_with_companies(self):
+        """Test that the changelist does not issue queries per company."""
+        changelist_url = reverse("admin:companies_company_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(changelist_url)
+        Company.objects.bulk_create(Company(name=f"Company {i}") for i in range(5))
+        with self.assertNumQueries(len(queries)):
+            self.client.get(changelist_url)
@@ -1,8 +1,21 @@
 """Geo models."""
 
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
+EXACTLY_ONE_RELATION_OR_COMPANY = (models.Q(relation__isnull=False) & models.Q(company__isnull=True)) | (
+    models.Q(relation__isnull=True) & models.Q(company__isnull=False)
+)
+
+
+class AddressQuerySet(models.QuerySet["Address"]):
+    """Represent a queryset of addresses."""
+
+    def with_owner(self):
+        """Load the relation and company of the addresses, for callers that read them per address."""
+        return self.select_related("company", "relation")
+
 
 class Address(models.Model):
     """Represent an address."""
@@ -33,25 +46,32 @@ class Address(models.Model):
         "companies.Company", on_delete=models.CASCADE, null=True, blank=True, verbose_name=_("company")
     )
 
+    objects = AddressQuerySet.as_manager()
+
     def __str__(self):
         """Return the address as a string.
 
-        `None` is passed to `filter` in order to remove false values (None, "", ...) from the
-        list of address components.
+        Empty address components are left out.
         """
-        filtered_fields = filter(
-            None,
-            [
-                self.line1,
-                self.line2,
-                self.line3,
-                self.line4,
-                f"{self.postal_code} {self.city}",
-                self.state_province_region,
-                self.get_country_display(),  # type: ignore[reportAttributeAccessIssue]
-            ],
+        postal_code_city = f"{self.postal_code} {self.city}" if self.postal_code or self.city else ""
+        components = (
+            self.line1,
+            self.line2,
+            self.line3,
+            self.line4,
+            postal_code_city,
+            self.state_province_region,
+            self.country_display,
         )
-        return "\n".join(filtered_fields)
+        return "\n".join([component for component in components if component])
+
+    @cached_property
+    def country_display(self) -> str:
+        """Return the display value of the country, cached per instance.
+
+        Unknown country codes are displayed as is.
+        """
+        return str(COUNTRY_DISPLAY.get(self.country, self.country))
 
     class Meta:
         """Add a correct plural name and a constraint to ensure either a Relation or Company is linked."""
@@ -60,10 +80,10 @@ class Address(models.Model):
         verbose_name_plural = _("addresses")
         constraints = [
             models.CheckConstraint(
-                condition=(  # type: ignore[reportCallIssue]
-                    (models.Q(relation__isnull=False) & models.Q(company__isnull=True))
-                    | (models.Q(relation__isnull=True) & models.Q(company__isnull=False))
-                ),
+                condition=EXACTLY_ONE_RELATION_OR_COMPANY,  # type: ignore[reportCallIssue]
                 name="address_must_have_exactly_one_relation_or_company",
             )
         ]
+
+
+COUNTRY_DISPLAY = dict(Address.Country.choices)
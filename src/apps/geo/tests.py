@@ -37,6 +37,21 @@ class GeoTests(TestCase):
         """Test the string representation."""
         self.assertEqual(str(self.address), "Koning Albert I-laan 123\n1000 Brussels\nBelgium")
 
+    def test_str_all_components(self):
+        """Test the string representation with all components and an unknown country code."""
+        address = Address(
+            line1="Line 1",
+            line2="Line 2",
+            line3="Line 3",
+            line4="Line 4",
+            postal_code="1000",
+            city="Brussels",
+            state_province_region="Brussels-Capital",
+            country="XX",
+        )
+        self.assertEqual(str(address), "Line 1\nLine 2\nLine 3\nLine 4\n1000 Brussels\nBrussels-Capital\nXX")
+        self.assertEqual(Address(country=Address.Country.NETHERLANDS).country_display, "Netherlands")
+
     def test_constraints(self):
         """Test the constraints."""
         address = Address(line1="Koning Albert I-laan 123", postal_code="1000", city="Brussels", country="BE")
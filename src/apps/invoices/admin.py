@@ -1,72 +1,109 @@
 """Invoices admin."""
 
+import smtplib
+
 from django.contrib import admin, messages
+from django.core import mail
 from django.core.exceptions import ValidationError
-from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 
-from apps.invoices.models import Invoice, InvoiceItem
+from apps.common.admin import PaginatedTabularInline
+from apps.invoices.models import Invoice, InvoiceItem, InvoiceQuerySet, reopen_email_connection
+
+CHUNK_SIZE = 500
+# Invoices loaded with `for_pdf()` carry their items, addresses and bank accounts, so fewer are kept in memory at once.
+PDF_CHUNK_SIZE = 50
+
+
+def _iterate(queryset: InvoiceQuerySet, *ordering: str, chunk_size: int = CHUNK_SIZE):
+    """Iterate over the invoices in chunks, with the relations used while processing and displaying them."""
+    queryset = queryset.select_related("company", "relation").order_by(*ordering)
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def _flush(invoices: list[Invoice], fields: list[str]):
+    """Save the fields of the given invoices in a single query and clear the list."""
+    Invoice.objects.bulk_update(invoices, fields)
+    invoices.clear()
 
 
 @admin.action(permissions=["change"], description=_("Confirm the selected invoices"))
-def confirm_pdf(modeladmin, request, queryset: QuerySet[Invoice]):  # noqa: ARG001  # pylint: disable=unused-argument
+def confirm_pdf(modeladmin, request, queryset: InvoiceQuerySet):  # noqa: ARG001  # pylint: disable=unused-argument
     """Confirm the selected invoices."""
-    for invoice in queryset.order_by("date"):
-        try:
-            invoice.confirm()
-        except ValidationError as error:
-            messages.error(request, f"{invoice}: {error}")
+    for invoice, error in queryset.confirm():
+        messages.error(request, f"{invoice}: {error}")
 
 
 @admin.action(permissions=["change"], description=_("Mark the selected invoices as paid"))
-def mark_as_paid(modeladmin, request, queryset: QuerySet[Invoice]):  # noqa: ARG001  # pylint: disable=unused-argument
+def mark_as_paid(modeladmin, request, queryset: InvoiceQuerySet):  # noqa: ARG001  # pylint: disable=unused-argument
     """Mark the selected invoices as paid."""
-    for invoice in queryset.order_by("number"):
+    paid_invoices: list[Invoice] = []
+    for invoice in _iterate(queryset, "number"):
         try:
-            invoice.mark_as_paid()
+            invoice.mark_as_paid(commit=False)
         except ValidationError as error:
             messages.error(request, f"{invoice}: {error}")
+        else:
+            paid_invoices.append(invoice)
+        if len(paid_invoices) >= CHUNK_SIZE:
+            _flush(paid_invoices, ["status"])
+    _flush(paid_invoices, ["status"])
 
 
 @admin.action(permissions=["change"], description=_("Create a PDF for the selected invoices"))
-def create_pdf(modeladmin, request, queryset: QuerySet[Invoice]):  # noqa: ARG001  # pylint: disable=unused-argument
+def create_pdf(modeladmin, request, queryset: InvoiceQuerySet):  # noqa: ARG001  # pylint: disable=unused-argument
     """Create a PDF for the selected invoices."""
-    for invoice in queryset.order_by("number"):
+    invoices_with_pdf: list[Invoice] = []
+    for invoice in _iterate(queryset.for_pdf(), "number", chunk_size=PDF_CHUNK_SIZE):
         try:
-            invoice.create_pdf()
+            invoice.create_pdf(commit=False, force=True)
         except ValidationError as error:
             messages.error(request, f"{invoice}: {error}")
+        else:
+            invoices_with_pdf.append(invoice)
+        if len(invoices_with_pdf) >= CHUNK_SIZE:
+            _flush(invoices_with_pdf, ["pdf_file", "pdf_fingerprint"])
+    _flush(invoices_with_pdf, ["pdf_file", "pdf_fingerprint"])
+
+
+def _send_by_email(request, queryset: InvoiceQuerySet, even_if_already_sent: bool):
+    """Send the invoices over a single email connection.
+
+    The status of every invoice is saved as soon as it is sent, so an interrupted action does not send it again.
+    When sending an invoice fails, the connection is reopened so the next invoices keep sharing a single connection.
+    """
+    with mail.get_connection() as connection:
+        for invoice in _iterate(queryset.for_pdf(), "date", "number", chunk_size=PDF_CHUNK_SIZE):
+            try:
+                invoice.send_by_email(even_if_already_sent=even_if_already_sent, connection=connection)
+            except ValidationError as error:
+                messages.error(request, f"{invoice}: {error}")
+            except (smtplib.SMTPException, OSError) as error:
+                messages.error(request, f"{invoice}: {error}")
+                reopen_email_connection(connection)
 
 
 @admin.action(permissions=["change"], description=_("Send the selected invoices by email"))
-def send_by_email(modeladmin, request, queryset: QuerySet[Invoice]):  # noqa: ARG001  # pylint: disable=unused-argument
+def send_by_email(modeladmin, request, queryset: InvoiceQuerySet):  # noqa: ARG001  # pylint: disable=unused-argument
     """Send the selected invoices by email.
 
     If an invoice does not have a pdf, it will be created.
     If the invoice was already sent, it will NOT be sent again.
     """
-    for invoice in queryset.order_by("date", "number"):
-        try:
-            invoice.send_by_email()
-        except ValidationError as error:
-            messages.error(request, f"{invoice}: {error}")
+    _send_by_email(request, queryset, even_if_already_sent=False)
 
 
 @admin.action(permissions=["change"], description=_("Send the selected invoices by email (even if already sent)"))
-def send_by_email_allow_resend(modeladmin, request, queryset: QuerySet[Invoice]):  # noqa: ARG001  # pylint: disable=unused-argument
+def send_by_email_allow_resend(modeladmin, request, queryset: InvoiceQuerySet):  # noqa: ARG001  # pylint: disable=unused-argument
     """Send the selected invoices by email.
 
     If an invoice does not have a pdf, it will be created.
     If the invoice was already sent, it will be sent again.
     """
-    for invoice in queryset.order_by("date", "number"):
-        try:
-            invoice.send_by_email(even_if_already_sent=True)
-        except ValidationError as error:
-            messages.error(request, f"{invoice}: {error}")
+    _send_by_email(request, queryset, even_if_already_sent=True)
 
 
-class InvoiceItemInline(admin.TabularInline):
+class InvoiceItemInline(PaginatedTabularInline):
     """Represent the InvoiceItem inline to add/remove items in the invoice admin."""
 
     model = InvoiceItem
@@ -83,6 +120,10 @@ class InvoiceAdmin(admin.ModelAdmin):
     readonly_fields = ("status", "number", "date_due", "payment_communication", "subtotal", "vat_amount", "total")
     actions = [confirm_pdf, create_pdf, send_by_email, send_by_email_allow_resend, mark_as_paid]
 
+    def get_queryset(self, request):
+        """Load the company and relation used by the string representation, to avoid two queries per invoice."""
+        return super().get_queryset(request).select_related("company", "relation")
+
     def has_delete_permission(self, request, obj: Invoice | None = None):
         """Do not allow to delete invoices that are not new or in draft."""
         if obj is not None and obj.status != Invoice.Status.DRAFT:
@@ -0,0 +1 @@
+"""Management package for the invoices app."""
@@ -0,0 +1,44 @@
+"""Django command to create PDFs for confirmed invoices outside of the request cycle."""
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from apps.invoices.models import Invoice
+
+
+class Command(BaseCommand):
+    """Create invoice PDFs."""
+
+    help = (
+        "Create a PDF for all confirmed invoices that do not have one yet. Scheduling this command after confirming "
+        "invoices keeps the PDF rendering out of the admin requests."
+    )
+
+    def add_arguments(self, parser):
+        """Add command line arguments."""
+        parser.add_argument(
+            "--invoice_id",
+            type=int,
+            default=0,
+            help="ID of the invoice, if not provided, all confirmed invoices without a PDF will be used.",
+        )
+
+    def handle(self, *_args, **options):
+        """Create a PDF for the selected invoices."""
+        invoices = self._get_invoices(options["invoice_id"])
+        for invoice in invoices.iterator(chunk_size=50):
+            try:
+                name = invoice.create_pdf(force=True)
+            except ValidationError as error:
+                self.stdout.write(self.style.WARNING(f"Unable to create a PDF for {invoice}: {error}"))
+                continue
+            self.stdout.write(self.style.SUCCESS(f"Created {name}."))
+
+    def _get_invoices(self, invoice_id: int):
+        invoices = Invoice.objects.for_pdf()
+        if invoice_id:
+            if not invoices.filter(pk=invoice_id).exists():
+                raise CommandError(f"Invoice with id {invoice_id} does not exist.")
+            return invoices.filter(pk=invoice_id)
+        return invoices.filter(Q(pdf_file="") | Q(pdf_file__isnull=True), status=Invoice.Status.CONFIRMED)
@@ -0,0 +1,57 @@
+"""Django command to send confirmed invoices by email outside of the request cycle."""
+
+import smtplib
+
+from django.core import mail
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.invoices.models import Invoice, reopen_email_connection
+
+
+class Command(BaseCommand):
+    """Send invoices by email."""
+
+    help = (
+        "Send all confirmed invoices by email, creating their PDF if needed. Scheduling this command after confirming "
+        "invoices keeps the PDF rendering and the SMTP traffic out of the admin requests."
+    )
+
+    def add_arguments(self, parser):
+        """Add command line arguments."""
+        parser.add_argument(
+            "--invoice_id",
+            type=int,
+            default=0,
+            help="ID of the invoice, if not provided, all confirmed invoices will be used.",
+        )
+
+    def handle(self, *_args, **options):
+        """Send the selected invoices over a single email connection.
+
+        The status of every invoice is saved as soon as it is sent, so an interrupted run does not send it again.
+        """
+        invoices = self._get_invoices(options["invoice_id"])
+        with mail.get_connection() as connection:
+            for invoice in invoices.iterator(chunk_size=50):
+                try:
+                    sent = invoice.send_by_email(connection=connection)
+                except ValidationError as error:
+                    self.stdout.write(self.style.WARNING(f"Unable to send {invoice}: {error}"))
+                    continue
+                except (smtplib.SMTPException, OSError) as error:
+                    self.stdout.write(self.style.ERROR(f"Unable to send {invoice}: {error}"))
+                    reopen_email_connection(connection)
+                    continue
+                if not sent:
+                    self.stdout.write(self.style.WARNING(f"Unable to send {invoice}: the email was not sent."))
+                    continue
+                self.stdout.write(self.style.SUCCESS(f"Sent {invoice}."))
+
+    def _get_invoices(self, invoice_id: int):
+        invoices = Invoice.objects.for_pdf().order_by("date", "number")
+        if invoice_id:
+            if not invoices.filter(pk=invoice_id).exists():
+                raise CommandError(f"Invoice with id {invoice_id} does not exist.")
+            return invoices.filter(pk=invoice_id)
+        return invoices.filter(status=Invoice.Status.CONFIRMED)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-16 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('invoices', '0001_initial'),
+        ('relations', '0002_alter_relation_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='invoice',
+            name='number',
+            field=models.CharField(db_index=True, editable=False, max_length=10, verbose_name='number'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['status', '-date'], name='invoice_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-16 15:09
+
+from decimal import Decimal
+from django.db import migrations, models
+
+CENTS = Decimal('0.01')
+
+
+def calculate_totals(apps, schema_editor):
+    Invoice = apps.get_model('invoices', 'Invoice')
+    invoices = []
+    for invoice in Invoice.objects.prefetch_related('invoiceitem_set').iterator(chunk_size=500):
+        items = invoice.invoiceitem_set.all()
+        subtotal = sum((item.unit_price * item.quantity for item in items), Decimal(0))
+        vat_basis = sum((item.unit_price * item.quantity * item.vat_percentage for item in items), Decimal(0))
+        invoice.subtotal = subtotal.quantize(CENTS)
+        invoice.vat_amount = (vat_basis / 100).quantize(CENTS)
+        invoice.total = invoice.subtotal + invoice.vat_amount
+        invoices.append(invoice)
+    Invoice.objects.bulk_update(invoices, ['subtotal', 'vat_amount', 'total'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0002_alter_invoice_number_invoice_invoice_status_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=12, verbose_name='subtotal'),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=12, verbose_name='total'),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='vat_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), editable=False, max_digits=12, verbose_name='VAT amount'),
+        ),
+        migrations.RunPython(calculate_totals, migrations.RunPython.noop),
+    ]
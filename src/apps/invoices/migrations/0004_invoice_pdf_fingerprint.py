@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0003_invoice_subtotal_invoice_total_invoice_vat_amount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='pdf_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='PDF fingerprint'),
+        ),
+    ]
@@ -1,28 +1,166 @@
 """Invoices models."""
 
 import calendar
+import datetime
+import hashlib
+import smtplib
+from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.core.mail import EmailMessage
-from django.db import models
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import models, transaction
+from django.db.models.functions import Cast
 from django.utils.formats import date_format
-from django.utils.translation import gettext, override
+from django.utils.translation import get_language, gettext, override
 from django.utils.translation import gettext_lazy as _
 
-import pdf.invoice
+from apps.companies.models import Company
+
+if TYPE_CHECKING:
+    import pdf.invoice
+
+CENTS = Decimal("0.01")
+
+
+def _first_related(instance: models.Model, related_name: str):
+    """Return the related object with the lowest pk, like `.first()`, using the prefetched objects if available."""
+    manager = getattr(instance, related_name)
+    if related_name in getattr(instance, "_prefetched_objects_cache", {}):
+        return min(manager.all(), key=lambda obj: obj.pk, default=None)
+    return manager.first()
+
+
+@lru_cache(maxsize=256)
+def _get_last_day(year: int, month: int):
+    """Return the last day of the given month."""
+    return calendar.monthrange(year, month)[1]
+
+
+@lru_cache(maxsize=32)
+def _get_labels(language: str | None):  # noqa: ARG001  # pylint: disable=unused-argument
+    """Return the labels used on the invoice PDF, translated in the given language.
+
+    The language is only used as cache key, the labels are translated in the active language.
+    """
+    get_field = InvoiceItem._meta.get_field
+    return {
+        "description": get_field("description").verbose_name.capitalize(),
+        "quantity": get_field("quantity").verbose_name.capitalize(),
+        "unit_price": get_field("unit_price").verbose_name.capitalize(),
+        "vat": get_field("vat_percentage").verbose_name.upper(),
+        "subtotal": gettext("subtotal").capitalize(),
+        "total": gettext("total").capitalize(),
+        "date": Invoice._meta.get_field("date").verbose_name.capitalize(),
+        "date_due": gettext("date due").capitalize(),
+        "payment_communication": gettext("payment communication").capitalize(),
+    }
+
+
+def _get_pdf_fingerprint(invoice_details: "pdf.invoice.InvoiceDetails") -> str:
+    """Return a hash of everything that ends up in the invoice PDF.
+
+    The modification times of the images are included, so replacing a logo with a file of the same name is detected.
+    """
+    image_mtimes = [Path(path).stat().st_mtime_ns for path in (invoice_details.logo, invoice_details.graphic_element)]
+    return hashlib.sha256(f"{invoice_details!r}|{image_mtimes}".encode()).hexdigest()
+
+
+def reopen_email_connection(connection: BaseEmailBackend):
+    """Close the connection after a failed send and open it again, so the next invoices keep sharing it.
+
+    When opening it again fails, the connection stays closed and the backend opens one per message instead.
+    """
+    connection.close()
+    try:
+        connection.open()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
+class InvoiceQuerySet(models.QuerySet["Invoice"]):
+    """Represent a queryset of invoices."""
+
+    def for_pdf(self):
+        """Load the relations that are used to create the PDF of the invoices.
+
+        The number of queries is constant instead of growing with the number of invoices.
+        """
+        return self.select_related("company", "relation").prefetch_related(
+            "invoiceitem_set", "company__address_set", "company__bankaccount_set", "relation__address_set"
+        )
+
+    def confirm(self):
+        """Confirm the draft invoices in bulk and return the invoices that could not be confirmed with their error.
+
+        The invoices are validated and numbered like `Invoice.confirm`, in date order, but the last dates and numbers
+        are fetched once per company and the invoices are saved with a single `bulk_update`.
+        """
+        errors: list[tuple[Invoice, ValidationError]] = []
+        confirmed: list[Invoice] = []
+        with transaction.atomic():
+            drafts = list(
+                self.filter(status=Invoice.Status.DRAFT)
+                .select_related("company", "relation")
+                .annotate(has_items=models.Exists(InvoiceItem.objects.filter(invoice=models.OuterRef("pk"))))
+                .order_by("date", "pk")
+            )
+            company_ids = {invoice.company.pk for invoice in drafts}
+            # Lock the companies, so invoices of the same company are numbered one after the other.
+            list(Company.objects.select_for_update().filter(pk__in=company_ids))
+            non_drafts = Invoice.objects.filter(company__in=company_ids).exclude(status=Invoice.Status.DRAFT).order_by()
+            last_dates = dict(
+                non_drafts.values("company").annotate(last_date=models.Max("date")).values_list("company", "last_date")
+            )
+            last_numbers = {
+                (company_id, year): last_number
+                for company_id, year, last_number in non_drafts.values("company", "date__year")
+                .annotate(last_number=models.Max(Cast("number", models.IntegerField())))
+                .values_list("company", "date__year", "last_number")
+            }
+            for invoice in drafts:
+                company_id = invoice.company.pk
+                has_items: bool = invoice.has_items  # type: ignore[reportAttributeAccessIssue]
+                try:
+                    invoice._validate_confirmation(has_items, last_dates.get(company_id))
+                except ValidationError as error:
+                    errors.append((invoice, error))
+                    continue
+                number = last_numbers.get((company_id, invoice.date.year)) or 0
+                last_numbers[(company_id, invoice.date.year)] = number + 1
+                last_dates[company_id] = invoice.date
+                invoice.number = f"{number + 1:04d}"
+                invoice.status = Invoice.Status.CONFIRMED
+                confirmed.append(invoice)
+            Invoice.objects.bulk_update(confirmed, ["status", "number"], batch_size=500)
+        return errors
+
+    def update_totals(self):
+        """Calculate and store the totals of the invoices like `Invoice.update_totals`, with one aggregate query."""
+        line_subtotal = models.F("invoiceitem__unit_price") * models.F("invoiceitem__quantity")
+        invoices = list(
+            self.order_by().annotate(
+                items_subtotal=models.Sum(line_subtotal),
+                vat_basis=models.Sum(line_subtotal * models.F("invoiceitem__vat_percentage")),
+            )
+        )
+        for invoice in invoices:
+            invoice._set_totals(invoice.items_subtotal, invoice.vat_basis)  # type: ignore[reportAttributeAccessIssue]
+        Invoice.objects.bulk_update(invoices, ["subtotal", "vat_amount", "total"], batch_size=500)
 
 
 class Invoice(models.Model):
     """Represent an invoice."""
 
     if TYPE_CHECKING:
-        from apps.companies.models import Company
         from apps.relations.models import Relation
 
         company: models.ForeignKey[Company]
+        company_id: int
         relation: models.ForeignKey[Relation]
         invoiceitem_set: models.Manager["InvoiceItem"]
 
@@ -34,7 +172,7 @@ class Invoice(models.Model):
         SENT = "sent", _("Sent")
         PAID = "paid", _("Paid")
 
-    number = models.CharField(verbose_name=_("number"), max_length=10, editable=False)
+    number = models.CharField(verbose_name=_("number"), max_length=10, editable=False, db_index=True)
     date = models.DateField(verbose_name=_("date"))
     company = models.ForeignKey("companies.Company", on_delete=models.CASCADE, verbose_name=_("company"))
     relation = models.ForeignKey("relations.Relation", on_delete=models.CASCADE, verbose_name=_("relation"))
@@ -42,6 +180,18 @@ class Invoice(models.Model):
         verbose_name=_("status"), max_length=10, choices=Status.choices, default=Status.DRAFT, editable=False
     )
     pdf_file = models.FileField(verbose_name=_("PDF file"), upload_to="invoices", blank=True, null=True)
+    pdf_fingerprint = models.CharField(verbose_name=_("PDF fingerprint"), max_length=64, blank=True, editable=False)
+    subtotal = models.DecimalField(
+        verbose_name=_("subtotal"), max_digits=12, decimal_places=2, default=Decimal(0), editable=False
+    )
+    vat_amount = models.DecimalField(
+        verbose_name=_("VAT amount"), max_digits=12, decimal_places=2, default=Decimal(0), editable=False
+    )
+    total = models.DecimalField(
+        verbose_name=_("total"), max_digits=12, decimal_places=2, default=Decimal(0), editable=False
+    )
+
+    objects = InvoiceQuerySet.as_manager()
 
     def __str__(self):
         """Return the string representation of the invoice."""
@@ -58,8 +208,7 @@ class Invoice(models.Model):
             year += 1
             month = 1
 
-        last_day = calendar.monthrange(year, month)[1]
-        return self.date.replace(year=year, month=month, day=last_day)
+        return self.date.replace(year=year, month=month, day=_get_last_day(year, month))
 
     @property
     def payment_communication(self):
@@ -71,45 +220,39 @@ class Invoice(models.Model):
         """
         if not self.number:
             return ""
-        first_ten = f"{self.date.year}{self.number}".zfill(10)
-        check_number = int(first_ten) % 97 or 97
-        check_digits = str(check_number).zfill(2)
-        return f"+++{first_ten[0:3]}/{first_ten[3:7]}/{first_ten[7:]}{check_digits}+++"
-
-    @property
-    def subtotal(self):
-        """Calculate the subtotal."""
-        return sum(item.subtotal for item in self.invoiceitem_set.all())
-
-    @property
-    def total(self):
-        """Calculate the total."""
-        return sum(item.total for item in self.invoiceitem_set.all())
-
-    @property
-    def vat_amount(self):
-        """Calculate the VAT amount."""
-        return sum(item.vat_amount for item in self.invoiceitem_set.all())
+        reference = self.date.year * 10 ** len(self.number) + int(self.number)
+        check_number = reference % 97 or 97
+        return (
+            f"+++{reference // 10**7:03d}/{reference // 10**3 % 10**4:04d}/{reference % 10**3:03d}{check_number:02d}+++"
+        )
 
     def save(self, *args, **kwargs):
         """Save the invoice.
 
         Generate the invoice number if the invoice is confirmed and the invoice number was not generated before.
+        The number follows the highest number of the company in the same year.
         """
-        if self.status == self.Status.CONFIRMED and not self.number:
-            self.number = str(
-                Invoice.objects.filter(company=self.company, date__year=self.date.year)
+        if self.status != self.Status.CONFIRMED or self.number:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            # Lock the company, so invoices of the same company are numbered one after the other.
+            Company.objects.select_for_update().filter(pk=self.company_id).exists()
+            last_number = (
+                Invoice.objects.filter(company_id=self.company_id, date__year=self.date.year)
                 .exclude(status=self.Status.DRAFT)
-                .count()
-                + 1
-            ).zfill(4)
-        return super().save(*args, **kwargs)
+                .aggregate(last_number=models.Max(Cast("number", models.IntegerField())))["last_number"]
+            )
+            self.number = f"{(last_number or 0) + 1:04d}"
+            return super().save(*args, **kwargs)
 
-    def mark_as_paid(self):
+    def mark_as_paid(self, commit: bool = True):
         """Mark the invoice as paid.
 
         Draft invoices cannot be marked as paid.
         If the invoice is already paid, this is a no-op.
+        When commit is False, the status is updated but the invoice is not saved. This allows callers to save many
+        invoices at once using `bulk_update`.
         """
         if self.status == self.Status.DRAFT:
             raise ValidationError(gettext("Draft invoices cannot be marked as paid"), code="invalid_status")
@@ -118,7 +261,8 @@ class Invoice(models.Model):
             return
 
         self.status = self.Status.PAID
-        self.save()
+        if commit:
+            self.save()
 
     def confirm(self):
         """Confirm the invoice.
@@ -130,27 +274,38 @@ class Invoice(models.Model):
         if self.status != self.Status.DRAFT:
             return
 
-        if not self.invoiceitem_set.exists():
-            raise ValidationError(gettext("An invoice without invoice items cannot be confirmed"), code="no_items")
-
+        has_items = self.invoiceitem_set.exists()
         last_non_draft = (
             Invoice.objects.filter(company=self.company).exclude(status=self.Status.DRAFT).order_by("-date").first()
         )
-        if last_non_draft and last_non_draft.date > self.date:
+        self._validate_confirmation(has_items, last_non_draft.date if last_non_draft else None)
+
+        self.status = self.Status.CONFIRMED
+        self.save()
+
+    def _validate_confirmation(self, has_items: bool, last_date: datetime.date | None):
+        if not has_items:
+            raise ValidationError(gettext("An invoice without invoice items cannot be confirmed"), code="no_items")
+        if last_date and last_date > self.date:
             raise ValidationError(
                 gettext(
                     "A non-draft invoice (date: %(last_date)s) exists after %(self_date)s. Update the date to at "
                     "least %(last_date)s."
                 ),
                 code="invalid_date",
-                params={"last_date": last_non_draft.date, "self_date": self.date},
+                params={"last_date": last_date, "self_date": self.date},
             )
 
-        self.status = self.Status.CONFIRMED
-        self.save()
+    def create_pdf(self, commit: bool = True, force: bool = False):
+        """Create a PDF for the invoice.
+
+        The PDF is only rendered again when its content changed since it was last created, or when the file is missing.
+        When force is True, the PDF is always rendered again, e.g. to pick up changes to the layout of the PDF itself.
+        When commit is False, the pdf_file is updated but the invoice is not saved. This allows callers to save many
+        invoices at once using `bulk_update`.
+        """
+        import pdf.invoice  # Imported here, as reportlab slows down the startup of every process
 
-    def create_pdf(self):
-        """Create a PDF for the invoice."""
         if self.status != self.Status.CONFIRMED:
             raise ValidationError(
                 gettext("Only confirmed invoices can have their PDF generated"), code="invalid_status"
@@ -179,15 +334,22 @@ class Invoice(models.Model):
             filename = self.pdf_file.field.generate_filename(self, name)
             invoice_path_str = default_storage.path(filename)
             invoice_path = Path(invoice_path_str)
-            invoice_path.parent.mkdir(parents=True, exist_ok=True)
-            invoice_pdf = pdf.invoice.InvoicePDF(invoice_details, pdf.invoice.PDFDetails(invoice_path_str))
-            invoice_pdf.generate()
+            fingerprint = _get_pdf_fingerprint(invoice_details)
+            if force or fingerprint != self.pdf_fingerprint or not invoice_path.exists():
+                invoice_path.parent.mkdir(parents=True, exist_ok=True)
+                invoice_pdf = pdf.invoice.InvoicePDF(invoice_details, pdf.invoice.PDFDetails(invoice_path_str))
+                invoice_pdf.generate()
         self.pdf_file.name = f"{self.pdf_file.field.upload_to}/{name}"
-        self.save()
+        self.pdf_fingerprint = fingerprint
+        if commit:
+            self.save()
         return name
 
-    def send_by_email(self, even_if_already_sent: bool = False):
-        """Send the invoice by email."""
+    def send_by_email(self, even_if_already_sent: bool = False, connection: BaseEmailBackend | None = None):
+        """Send the invoice by email and return whether it was sent.
+
+        An open email connection can be provided to reuse it across multiple invoices.
+        """
         if self.status == self.Status.DRAFT:
             raise ValidationError(gettext("Draft invoices can not be sent by email"), code="invalid_status")
         if self.status == self.Status.SENT and not even_if_already_sent:
@@ -200,49 +362,78 @@ class Invoice(models.Model):
             )
         if not self.pdf_file:
             self.create_pdf()
+        try:
+            pdf_content = Path(self.pdf_file.path).read_bytes()
+        except OSError as error:
+            raise ValidationError(
+                gettext("The PDF file (%(name)s) cannot be read"),
+                code="unreadable_pdf",
+                params={"name": self.pdf_file.name},
+            ) from error
         email_message = EmailMessage(
             subject=f"{self._get_invoice_title()} - {self.company.name}",
             body="Please find attached the invoice.",
             from_email=self.company.email,
             to=[self.relation.email],
-            attachments=[
-                (
-                    self.pdf_file.name,
-                    Path(self.pdf_file.path).read_bytes(),
-                )
-            ],
+            connection=connection,
+            attachments=[(self.pdf_file.name, pdf_content)],
         )
-        mail_sent = email_message.send()
+        mail_sent = bool(email_message.send())
         if mail_sent:
             self.status = self.Status.SENT
             self.save()
+        return mail_sent
 
     def _get_invoice_title(self):
         model_verbose_name = self._meta.verbose_name or type(self).__name__
         return f"{model_verbose_name.capitalize()} #VK/{self.date.year}/{self.number}"
 
     def _get_invoice_details(self, details_from, details_to, title, lines, summary, invoice_date, invoice_date_due):
+        import pdf.invoice
+
+        labels = _get_labels(get_language())
         invoice_details = pdf.invoice.InvoiceDetails(
             details_from=details_from,
             details_to=details_to,
             title=title,
-            date={self._meta.get_field("date").verbose_name.capitalize(): invoice_date},
-            due_date={gettext("date due").capitalize(): invoice_date_due},
-            payment_communication={gettext("payment communication").capitalize(): self.payment_communication},
+            date={labels["date"]: invoice_date},
+            due_date={labels["date_due"]: invoice_date_due},
+            payment_communication={labels["payment_communication"]: self.payment_communication},
             lines=lines,
             summary=summary,
         )
         return invoice_details
 
+    def update_totals(self):
+        """Calculate the subtotal, VAT amount and total from the invoice items and store them.
+
+        The sums are computed with a single aggregate query. The division by 100 of the VAT basis is done in Python,
+        as SQLite would perform an integer division.
+        """
+        line_subtotal = models.F("unit_price") * models.F("quantity")
+        sums = self.invoiceitem_set.aggregate(
+            subtotal=models.Sum(line_subtotal), vat_basis=models.Sum(line_subtotal * models.F("vat_percentage"))
+        )
+        self._set_totals(sums["subtotal"], sums["vat_basis"])
+        Invoice.objects.filter(pk=self.pk).update(subtotal=self.subtotal, vat_amount=self.vat_amount, total=self.total)
+
+    def _set_totals(self, subtotal: Decimal | None, vat_basis: Decimal | None):
+        self.subtotal = Decimal(subtotal or 0).quantize(CENTS)
+        self.vat_amount = (Decimal(vat_basis or 0) / 100).quantize(CENTS)
+        self.total = self.subtotal + self.vat_amount
+
     def _get_summary(self):
+        labels = _get_labels(get_language())
         summary = {
-            gettext("subtotal").capitalize(): f"{self.subtotal:.2f}",
-            gettext("VAT").upper(): f"{self.vat_amount:.2f}",
-            gettext("total").capitalize(): f"{self.total:.2f}",
+            labels["subtotal"]: f"{self.subtotal:.2f}",
+            labels["vat"]: f"{self.vat_amount:.2f}",
+            labels["total"]: f"{self.total:.2f}",
         }
         return summary
 
     def _get_details_to(self, relation_address):
+        import pdf.invoice
+
         details_to = pdf.invoice.DetailsTo(
             gettext("ATTN."),
             self.relation.name,
@@ -254,6 +445,8 @@ class Invoice(models.Model):
         return details_to
 
     def _get_details_from(self, invoice_address, bank_account):
+        import pdf.invoice
+
         details_from = pdf.invoice.DetailsFrom(
             self.company.name,
             invoice_address.line1,
@@ -268,19 +461,19 @@ class Invoice(models.Model):
         return details_from
 
     def _get_relation_address(self):
-        relation_address = self.relation.address_set.first()
+        relation_address = _first_related(self.relation, "address_set")
         if not relation_address:
             raise ValidationError(gettext("Relation has no address"), code="no_address")
         return relation_address
 
     def _get_bank_account(self):
-        bank_account = self.company.bankaccount_set.first()
+        bank_account = _first_related(self.company, "bankaccount_set")
         if not bank_account:
             raise ValidationError(gettext("Company has no bank account"), code="no_bank_account")
         return bank_account
 
     def _get_invoice_address(self):
-        invoice_address = self.company.address_set.first()
+        invoice_address = _first_related(self.company, "address_set")
         if not invoice_address:
             raise ValidationError(gettext("Company has no address"), code="no_address")
         return invoice_address
@@ -290,6 +483,7 @@ class Invoice(models.Model):
 
         verbose_name = _("invoice")
         verbose_name_plural = _("invoices")
+        indexes = [models.Index(fields=["status", "-date"], name="invoice_status_date_idx")]
 
 
 class InvoiceItem(models.Model):
@@ -311,21 +505,37 @@ class InvoiceItem(models.Model):
     @property
     def vat_amount(self):
         """Calculate the VAT amount."""
-        return self.subtotal * self.vat_percentage / 100
+        return self._get_vat_amount(self.subtotal)
 
     @property
     def total(self):
         """Calculate the total."""
-        return self.subtotal + self.vat_amount
+        subtotal = self.subtotal
+        return subtotal + self._get_vat_amount(subtotal)
+
+    def _get_vat_amount(self, subtotal: Decimal) -> Decimal:
+        return subtotal * self.vat_percentage / 100
+
+    def save(self, *args, **kwargs):
+        """Save the invoice item and update the totals of its invoice."""
+        super().save(*args, **kwargs)
+        self.invoice.update_totals()
+
+    def delete(self, *args, **kwargs):
+        """Delete the invoice item and update the totals of its invoice."""
+        deleted = super().delete(*args, **kwargs)
+        self.invoice.update_totals()
+        return deleted
 
     def to_dict(self):
         """Return the invoice item as a dictionary."""
+        labels = _get_labels(get_language())
         return {
-            self._meta.get_field("description").verbose_name.capitalize(): self.description,
-            self._meta.get_field("quantity").verbose_name.capitalize(): self.quantity,
-            self._meta.get_field("unit_price").verbose_name.capitalize(): self.unit_price,
-            self._meta.get_field("vat_percentage").verbose_name.upper(): f"{int(self.vat_percentage)}%",
-            gettext("subtotal").capitalize(): f"{self.subtotal:.2f}",
+            labels["description"]: self.description,
+            labels["quantity"]: self.quantity,
+            labels["unit_price"]: self.unit_price,
+            labels["vat"]: f"{int(self.vat_percentage)}%",
+            labels["subtotal"]: f"{self.subtotal:.2f}",
         }
 
     def __str__(self):
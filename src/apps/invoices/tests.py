@@ -1,22 +1,42 @@
 """Invoices app tests."""
 
 import shutil
+import smtplib
 import tempfile
 from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
 
+from django.contrib.auth import get_user_model
 from django.core import mail
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase, override_settings
+from django.urls import reverse
 
 from apps.companies.models import Company
 from apps.invoices.models import Invoice, InvoiceItem
 from apps.relations.models import Relation
 
-TEMP_MEDIA_ROOT = tempfile.mkdtemp()
 
+class TemporaryMediaRootTestCase(TestCase):
+    """Store the files created by the tests in a temporary media root, removed once the tests of the class ran.
 
-@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
-class InvoicesTest(TestCase):
+    Every class gets its own directory, so the test classes can run in parallel.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Use a temporary directory as media root for the tests of the class."""
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+        super().setUpClass()
+
+
+class InvoicesTest(TemporaryMediaRootTestCase):
     """Invoices model tests."""
 
     fixtures = ["companies", "relations", "invoices", "geo"]
@@ -58,6 +78,40 @@ class InvoicesTest(TestCase):
         self.assertEqual(self.invoice_item.vat_amount, 42)
         self.assertEqual(self.invoice_item.total, 242)
 
+    def test_invoice_totals(self):
+        """Test the totals are stored on the invoice when its items change."""
+        self.invoice_4.invoiceitem_set.create(description="A", unit_price=10, quantity=1, vat_percentage=21)
+        item = self.invoice_4.invoiceitem_set.create(description="B", unit_price="0.10", quantity=3, vat_percentage=6)
+        self.assertEqual(
+            (self.invoice_4.subtotal, self.invoice_4.vat_amount, self.invoice_4.total),
+            (Decimal("10.30"), Decimal("2.12"), Decimal("12.42")),
+        )
+        stored = Invoice.objects.get(pk=self.invoice_4.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(list(stored._get_summary().values()), ["10.30", "2.12", "12.42"])
+
+        item.delete()
+        stored.refresh_from_db()
+        self.assertEqual((stored.subtotal, stored.vat_amount, stored.total), (10, Decimal("2.10"), Decimal("12.10")))
+
+    def test_invoice_for_pdf(self):
+        """Test the relations used to create the PDF are loaded by `for_pdf`."""
+        expected = (
+            self.company.address_set.first(),
+            self.company.bankaccount_set.first(),
+            self.relation.address_set.first(),
+            self.invoice._get_summary(),
+        )
+        invoice = Invoice.objects.for_pdf().get(pk=self.invoice.pk)
+        with self.assertNumQueries(0):
+            loaded = (
+                invoice._get_invoice_address(),
+                invoice._get_bank_account(),
+                invoice._get_relation_address(),
+                invoice._get_summary(),
+            )
+        self.assertEqual(loaded, expected)
+
     def test_invoice_str(self):
         """Test the invoice string representation."""
         self.assertEqual(str(self.invoice), "2025/0001: 242.00 (IDA Inc.->Dummy Customer) Due: 2025-02-28")
@@ -95,6 +149,14 @@ class InvoicesTest(TestCase):
         self.invoice.save()
         self.assertEqual(self.invoice.number, "0001")
 
+    def test_invoice_number_without_loading_company(self):
+        """Test that generating the invoice number does not load the company."""
+        invoice = Invoice.objects.get(pk=self.invoice_3.pk)
+        invoice.status = Invoice.Status.CONFIRMED
+        invoice.save()
+        self.assertEqual(invoice.number, "0001")
+        self.assertFalse(Invoice.company.is_cached(invoice))
+
     def test_invoice_confirm(self):
         """Test the invoice confirm method."""
         self.assertEqual(self.invoice.status, Invoice.Status.CONFIRMED)
@@ -120,6 +182,20 @@ class InvoicesTest(TestCase):
         self.assertEqual(self.invoice_4.status, Invoice.Status.CONFIRMED)
         self.assertEqual(self.invoice_4.number, "0002")  # Should be the second of 2026
 
+    def test_invoice_queryset_confirm(self):
+        """Test the invoices are confirmed in bulk with the same validation and numbering as `confirm`."""
+        invoice_5 = Invoice.objects.create(company=self.company, relation=self.relation, date=date(2026, 2, 1))
+        invoice_5.invoiceitem_set.create(description="Test", unit_price=100, quantity=1, vat_percentage=21)
+        with self.assertNumQueries(7):
+            errors = Invoice.objects.filter(pk__in=[1, 3, 4, invoice_5.pk]).confirm()
+        self.assertEqual([(invoice.pk, error.code) for invoice, error in errors], [(4, "no_items")])
+        numbers = dict(Invoice.objects.filter(pk__in=[1, 3, invoice_5.pk]).values_list("pk", "number"))
+        self.assertEqual(numbers, {1: "0001", 3: "0001", invoice_5.pk: "0002"})
+
+        self.invoice_4.invoiceitem_set.create(description="Test", unit_price=100, quantity=1, vat_percentage=21)
+        errors = Invoice.objects.filter(pk=4).confirm()
+        self.assertEqual([(invoice.pk, error.code) for invoice, error in errors], [(4, "invalid_date")])
+
     def test_invoice_mark_as_paid(self):
         """Test the invoice mark_as_paid method."""
         self.assertEqual(self.invoice.status, Invoice.Status.CONFIRMED)
@@ -171,6 +247,23 @@ class InvoicesTest(TestCase):
         self.invoice_2.create_pdf()
         self.assertTrue(self.invoice_2.pdf_file)
 
+    def test_invoice_create_pdf_unchanged(self):
+        """Test that the PDF is only rendered again when its content changed."""
+        self.invoice.create_pdf()
+        fingerprint = self.invoice.pdf_fingerprint
+        self.assertEqual(len(fingerprint), 64)
+
+        with patch("pdf.invoice.InvoicePDF.generate") as generate:
+            self.invoice.create_pdf()
+            generate.assert_not_called()
+
+            self.invoice.invoiceitem_set.create(
+                description="Extra", unit_price=Decimal(10), quantity=Decimal(1), vat_percentage=Decimal(21)
+            )
+            self.invoice.create_pdf()
+            generate.assert_called_once()
+        self.assertNotEqual(self.invoice.pdf_fingerprint, fingerprint)
+
     def test_invoice_send_by_email(self):
         """Test the invoice send by email method."""
         self.assertEqual(len(mail.outbox), 0)
@@ -237,6 +330,188 @@ class InvoicesTest(TestCase):
         new_invoice.confirm()
         self.assertEqual(new_invoice.number, "0001")
 
-    def tearDown(self):
-        """Clean up files after the test to avoid polluting storage."""
-        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+    def test_invoice_number_follows_last_number(self):
+        """Test that the invoice number follows the highest number of the year, not the number of invoices."""
+        Invoice.objects.filter(pk=self.invoice_2.pk).update(number="0009")
+        self.invoice_4.status = Invoice.Status.CONFIRMED
+        self.invoice_4.save()
+        self.assertEqual(self.invoice_4.number, "0010")
+
+    def test_createinvoicepdfs(self):
+        """Test the createinvoicepdfs management command."""
+        with self.assertRaises(CommandError) as cm:
+            call_command("createinvoicepdfs", invoice_id=999, stdout=StringIO())
+        self.assertIn("Invoice with id 999 does not exist.", str(cm.exception))
+
+        out = StringIO()
+        call_command("createinvoicepdfs", stdout=out)
+        self.assertIn("Created ida_inc_invoice_2025_0001.pdf.", out.getvalue())
+        self.assertIn("Created ida_inc_invoice_2025_0002.pdf.", out.getvalue())
+        self.assertTrue(Invoice.objects.get(pk=1).pdf_file)
+
+        out = StringIO()
+        call_command("createinvoicepdfs", stdout=out)
+        self.assertEqual(out.getvalue(), "")
+
+        with patch("pdf.invoice.InvoicePDF.generate") as generate:
+            call_command("createinvoicepdfs", invoice_id=self.invoice.pk, stdout=StringIO())
+        generate.assert_called_once()
+
+        out = StringIO()
+        call_command("createinvoicepdfs", invoice_id=self.invoice_3.pk, stdout=out)
+        self.assertIn("Only confirmed invoices can have their PDF generated", out.getvalue())
+
+    def test_sendinvoices(self):
+        """Test the sendinvoices management command."""
+        with self.assertRaises(CommandError) as cm:
+            call_command("sendinvoices", invoice_id=999, stdout=StringIO())
+        self.assertIn("Invoice with id 999 does not exist.", str(cm.exception))
+
+        out = StringIO()
+        call_command("sendinvoices", stdout=out)
+        self.assertIn("has no email address", out.getvalue())
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.relation.email = "dummy@example.com"
+        self.relation.save()
+        out = StringIO()
+        with patch("django.core.mail.backends.locmem.EmailBackend.send_messages", return_value=0):
+            call_command("sendinvoices", invoice_id=self.invoice.pk, stdout=out)
+        self.assertIn(f"Unable to send {self.invoice}: the email was not sent.", out.getvalue())
+        self.assertFalse(Invoice.objects.filter(status=Invoice.Status.SENT).exists())
+
+        out = StringIO()
+        call_command("sendinvoices", stdout=out)
+        self.assertIn(f"Sent {self.invoice}.", out.getvalue())
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(Invoice.objects.filter(status=Invoice.Status.SENT).count(), 2)
+
+        out = StringIO()
+        call_command("sendinvoices", stdout=out)
+        self.assertEqual(out.getvalue(), "")
+
+    def test_sendinvoices_interrupted(self):
+        """Test the sendinvoices command saves the status of the sent invoices before it gets interrupted."""
+        Relation.objects.filter(pk=self.relation.pk).update(email="dummy@example.com")
+        send_messages = "django.core.mail.backends.locmem.EmailBackend.send_messages"
+        with patch(send_messages, side_effect=[1, KeyboardInterrupt]), self.assertRaises(KeyboardInterrupt):
+            call_command("sendinvoices", stdout=StringIO())
+        statuses = dict(Invoice.objects.filter(pk__in=[1, 2]).values_list("pk", "status"))
+        self.assertEqual(statuses, {1: Invoice.Status.SENT, 2: Invoice.Status.CONFIRMED})
+
+    @override_settings(EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend")
+    def test_sendinvoices_reopens_connection(self):
+        """Test the sendinvoices command keeps sharing one reopened connection after an SMTP error."""
+        Relation.objects.filter(pk=self.relation.pk).update(email="dummy@example.com")
+        Invoice.objects.filter(pk=self.invoice_3.pk).update(status=Invoice.Status.CONFIRMED, number="0003")
+        out = StringIO()
+        with patch("django.core.mail.backends.smtp.smtplib.SMTP") as smtp:
+            smtp.return_value.sendmail.side_effect = [smtplib.SMTPServerDisconnected("Connection lost"), {}, {}]
+            call_command("sendinvoices", stdout=out)
+        self.assertIn(f"Unable to send {self.invoice}: Connection lost", out.getvalue())
+        self.assertEqual(smtp.call_count, 2)
+        self.assertEqual(Invoice.objects.filter(status=Invoice.Status.SENT).count(), 2)
+
+
+class InvoicesAdminTest(TemporaryMediaRootTestCase):
+    """Invoices admin action tests."""
+
+    fixtures = ["companies", "relations", "invoices", "geo"]
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up the test data."""
+        cls.admin_user = get_user_model().objects.create_superuser(username="admin", password="testpass1234")
+        cls.changelist_url = reverse("admin:invoices_invoice_changelist")
+
+    def setUp(self):
+        """Log in as the admin user."""
+        self.client.force_login(self.admin_user)
+
+    def run_action(self, action: str, *pks: int):
+        """Run the given admin action on the given invoices."""
+        data = {"action": action, "_selected_action": [str(pk) for pk in pks]}
+        return self.client.post(self.changelist_url, data, follow=True)
+
+    def test_confirm(self):
+        """Test the confirm action confirms valid invoices and reports invalid ones."""
+        response = self.run_action("confirm_pdf", 3, 4)
+        self.assertContains(response, "An invoice without invoice items cannot be confirmed")
+        statuses = dict(Invoice.objects.filter(pk__in=[3, 4]).values_list("pk", "status"))
+        self.assertEqual(statuses, {3: Invoice.Status.CONFIRMED, 4: Invoice.Status.DRAFT})
+
+    def test_mark_as_paid(self):
+        """Test the mark_as_paid action updates valid invoices and reports invalid ones."""
+        response = self.run_action("mark_as_paid", 1, 2, 3)
+        self.assertContains(response, "Draft invoices cannot be marked as paid")
+        statuses = dict(Invoice.objects.filter(pk__in=[1, 2, 3]).values_list("pk", "status"))
+        self.assertEqual(statuses, {1: Invoice.Status.PAID, 2: Invoice.Status.PAID, 3: Invoice.Status.DRAFT})
+
+    def test_create_pdf(self):
+        """Test the create_pdf action stores the PDF for valid invoices and reports invalid ones."""
+        response = self.run_action("create_pdf", 1, 3)
+        self.assertContains(response, "Only confirmed invoices can have their PDF generated")
+        self.assertEqual(Invoice.objects.get(pk=1).pdf_file.name, "invoices/ida_inc_invoice_2025_0001.pdf")
+        self.assertFalse(Invoice.objects.get(pk=3).pdf_file)
+
+    def test_create_pdf_unchanged(self):
+        """Test the create_pdf action renders the PDF again, even when its content did not change."""
+        self.run_action("create_pdf", 1)
+        with patch("pdf.invoice.InvoicePDF.generate") as generate:
+            self.run_action("create_pdf", 1)
+        generate.assert_called_once()
+
+    def test_send_by_email(self):
+        """Test the send_by_email action sends valid invoices and reports invalid ones."""
+        Relation.objects.filter(pk=1).update(email="dummy@example.com")
+        response = self.run_action("send_by_email", 1, 2, 3)
+        self.assertContains(response, "Draft invoices can not be sent by email")
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(Invoice.objects.filter(status=Invoice.Status.SENT).count(), 2)
+
+    def test_send_by_email_smtp_error(self):
+        """Test the send_by_email action reports SMTP errors and continues with the next invoice."""
+        Relation.objects.filter(pk=1).update(email="dummy@example.com")
+        send_messages = "django.core.mail.backends.locmem.EmailBackend.send_messages"
+        with patch(send_messages, side_effect=[smtplib.SMTPServerDisconnected("Connection lost"), 1]):
+            response = self.run_action("send_by_email", 1, 2)
+        self.assertContains(response, "Connection lost")
+        statuses = dict(Invoice.objects.filter(pk__in=[1, 2]).values_list("pk", "status"))
+        self.assertEqual(statuses, {1: Invoice.Status.CONFIRMED, 2: Invoice.Status.SENT})
+
+    def test_send_by_email_interrupted(self):
+        """Test the send_by_email action saves the status of the sent invoices before it gets interrupted."""
+        Relation.objects.filter(pk=1).update(email="dummy@example.com")
+        send_messages = "django.core.mail.backends.locmem.EmailBackend.send_messages"
+        with (
+            patch(send_messages, side_effect=[1, RuntimeError("Worker timeout")]),
+            self.assertRaises(RuntimeError),
+            self.assertLogs("django.request", "ERROR"),
+        ):
+            self.run_action("send_by_email", 1, 2)
+        statuses = dict(Invoice.objects.filter(pk__in=[1, 2]).values_list("pk", "status"))
+        self.assertEqual(statuses, {1: Invoice.Status.SENT, 2: Invoice.Status.CONFIRMED})
+
+    def test_send_by_email_unreadable_pdf(self):
+        """Test the send_by_email action reports an unreadable PDF without reopening the connection."""
+        Relation.objects.filter(pk=1).update(email="dummy@example.com")
+        Invoice.objects.filter(pk=1).update(pdf_file="invoices/missing.pdf")
+        with patch("apps.invoices.admin.reopen_email_connection") as reopen_email_connection:
+            response = self.run_action("send_by_email", 1, 2)
+        self.assertContains(response, "The PDF file (invoices/missing.pdf) cannot be read")
+        reopen_email_connection.assert_not_called()
+        statuses = dict(Invoice.objects.filter(pk__in=[1, 2]).values_list("pk", "status"))
+        self.assertEqual(statuses, {1: Invoice.Status.CONFIRMED, 2: Invoice.Status.SENT})
+
+    @override_settings(EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend")
+    def test_send_by_email_reopens_connection(self):
+        """Test the send_by_email action keeps sharing one reopened connection after an SMTP error."""
+        Relation.objects.filter(pk=1).update(email="dummy@example.com")
+        Invoice.objects.filter(pk=3).update(status=Invoice.Status.CONFIRMED, number="0003")
+        with patch("django.core.mail.backends.smtp.smtplib.SMTP") as smtp:
+            smtp.return_value.sendmail.side_effect = [smtplib.SMTPServerDisconnected("Connection lost"), {}, {}]
+            response = self.run_action("send_by_email", 1, 2, 3)
+        self.assertContains(response, "Connection lost")
+        self.assertEqual(smtp.call_count, 2)
+        statuses = dict(Invoice.objects.filter(pk__in=[1, 2, 3]).values_list("pk", "status"))
+        self.assertEqual(statuses, {1: Invoice.Status.CONFIRMED, 2: Invoice.Status.SENT, 3: Invoice.Status.SENT})
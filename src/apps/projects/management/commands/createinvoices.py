@@ -1,17 +1,27 @@
 """Django command to create invoices for completed timesheets for a given month/year."""
 
 import calendar
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import groupby
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Sum
+from django.db import transaction
+from django.db.models import Prefetch
 from django.db.models.manager import BaseManager
 from django.utils import timezone
 from django.utils.translation import override
 
 from apps.invoices.models import Invoice, InvoiceItem
 from apps.projects.models import Project, Rate
-from apps.timesheets.models import Timesheet
+from apps.timesheets.models import Timesheet, TimesheetItem
+
+# The labels are lazy translations, they are translated in the language that is active when the description is built.
+ITEM_TYPE_LABELS = dict(TimesheetItem.ItemType.choices)
+RATE_TYPE_LABELS = dict(Rate.RateType.choices)
+
+HOURS_PER_DAY = Decimal(8)
 
 
 class Command(BaseCommand):
@@ -45,65 +55,112 @@ class Command(BaseCommand):
 
     def _create_invoices(self, project_id: int, month: int, year: int, user_id: int):
         projects = self._get_projects(project_id)
-        zfilled_month = str(month).zfill(2)
-        for project in projects:
-            timesheets = self._get_timesheets(month, year, user_id, project)
-            if not timesheets.exists():
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"No completed timesheets found for {user_id=} on project {project=} in {zfilled_month}/{year}."
-                    )
+        zfilled_month = f"{month:02d}"
+        invoice_date = date(year, month, calendar.monthrange(year, month)[1])
+        # The projects are ordered by the language of their relation, so each language is activated once.
+        for language, language_projects in groupby(projects, key=lambda project: project.relation.language):
+            with override(language, deactivate=True):
+                for project in language_projects:
+                    self._create_project_invoices(month, year, user_id, zfilled_month, invoice_date, project)
+
+    def _create_project_invoices(
+        self, month: int, year: int, user_id: int, zfilled_month: str, invoice_date: date, project: Project
+    ):
+        item_types = {project_rate.item_type for project_rate in project.rate_set.all()}
+        if not item_types:
+            self.stdout.write(self.style.WARNING(f"No rates found for project {project}."))
+            return
+
+        timesheets = self._get_timesheets(month, year, user_id, project, item_types)
+        if not timesheets.exists():
+            self.stdout.write(
+                self.style.WARNING(
+                    f"No completed timesheets found for {user_id=} on project {project=} in {zfilled_month}/{year}."
                 )
-                return
+            )
+            return
 
-            with override(project.relation.language, deactivate=True):
-                self._create_invoices_from_timesheets(year, zfilled_month, project, timesheets)
+        self._create_invoices_from_timesheets(year, zfilled_month, invoice_date, project, timesheets)
 
     def _create_invoices_from_timesheets(
-        self, year: int, zfilled_month: str, project: Project, timesheets: BaseManager[Timesheet]
+        self, year: int, zfilled_month: str, invoice_date: date, project: Project, timesheets: BaseManager[Timesheet]
     ):
+        invoices: list[Invoice] = []
+        items: list[InvoiceItem] = []
+        invoiced_timesheets: list[Timesheet] = []
+        descriptions = {
+            project_rate.pk: (
+                f"[{project.invoice_line_prefix}] {ITEM_TYPE_LABELS[project_rate.item_type]} "
+                f"({RATE_TYPE_LABELS[project_rate.rate_type]})"
+            )
+            for project_rate in project.rate_set.all()
+        }
         for timesheet in timesheets:
-            last_day = calendar.monthrange(timesheet.year, timesheet.month)[1]
-            invoice_date = timezone.datetime(timesheet.year, timesheet.month, last_day).date()
-            invoice = Invoice.objects.create(relation=project.relation, company=project.company, date=invoice_date)
+            invoice = Invoice(relation=project.relation, company=project.company, date=invoice_date)
 
-            items = self._generate_invoice_items(project, timesheet, invoice)
-            if not items:
+            invoice_items = self._generate_invoice_items(project, timesheet, invoice, descriptions)
+            if not invoice_items:
                 self.stdout.write(
                     self.style.WARNING(f"No invoice items created for project {project} in {zfilled_month}/{year}.")
                 )
                 continue
 
-            invoice.invoiceitem_set.bulk_create(items)
+            invoices.append(invoice)
+            items.extend(invoice_items)
+            invoiced_timesheets.append(timesheet)
+
+        with transaction.atomic():
+            Invoice.objects.bulk_create(invoices)
+            InvoiceItem.objects.bulk_create(items, batch_size=500)
+            Invoice.objects.filter(pk__in=[invoice.pk for invoice in invoices]).update_totals()
 
+        for timesheet in invoiced_timesheets:
             self.stdout.write(self.style.SUCCESS(f"Created invoice for {timesheet}."))
 
-    def _get_timesheets(self, month: int, year: int, user_id: int, project: Project):
-        timesheets = Timesheet.objects.filter(
-            project=project, month=month, year=year, status=Timesheet.Status.COMPLETED, user__is_active=True
+    def _get_timesheets(self, month: int, year: int, user_id: int, project: Project, item_types: set[int]):
+        timesheet_items = TimesheetItem.objects.filter(item_type__in=item_types).only(
+            "timesheet", "item_type", "worked_hours"
+        )
+        timesheets = (
+            Timesheet.objects.filter(
+                project=project, month=month, year=year, status=Timesheet.Status.COMPLETED, user__is_active=True
+            )
+            .select_related("user", "project")
+            .defer("project__description")
+            .prefetch_related(Prefetch("timesheetitem_set", queryset=timesheet_items))
         )
         if user_id:
             timesheets = timesheets.filter(user_id=user_id)
         return timesheets
 
     def _get_projects(self, project_id: int):
+        projects = (
+            Project.objects.select_related("relation", "company")
+            .defer("description")
+            .prefetch_related("rate_set")
+            .order_by("relation__language", "pk")
+        )
         if project_id:
             try:
-                project = Project.objects.get(pk=project_id)
+                project = projects.get(pk=project_id)
             except Project.DoesNotExist as exc:
                 raise CommandError(f"Project with id {project_id} does not exist.") from exc
-            projects = [project]
-        else:
-            projects = Project.objects.all()
+            return [project]
         return projects
 
-    def _generate_invoice_items(self, project: Project, timesheet: Timesheet, invoice: Invoice):
-        """Generate invoice items based on the project's rates and the timesheet."""
+    def _generate_invoice_items(
+        self, project: Project, timesheet: Timesheet, invoice: Invoice, descriptions: dict[int, str]
+    ):
+        """Generate invoice items based on the project's rates and the timesheet.
+
+        The descriptions of the invoice items are built once per project and passed by rate id.
+        """
         items: list[InvoiceItem] = []
+        hours_per_item_type: dict[int, float] = defaultdict(float)
+        for timesheet_item in timesheet.timesheetitem_set.all():
+            hours_per_item_type[timesheet_item.item_type] += timesheet_item.worked_hours
         for project_rate in project.rate_set.all():
-            total_hours = timesheet.timesheetitem_set.filter(item_type=project_rate.item_type).aggregate(
-                total=Sum("worked_hours")
-            )["total"]
+            total_hours = hours_per_item_type.get(project_rate.item_type)
             if not total_hours:
                 continue
 
@@ -112,13 +169,9 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.NOTICE(f"No hours to invoice for {project_rate} on project {project}."))
                 continue
 
-            item_description = (
-                f"[{project.invoice_line_prefix}] {project_rate.get_item_type_display()} "
-                f"({project_rate.get_rate_type_display()})"
-            )
             item = InvoiceItem(
                 invoice=invoice,
-                description=item_description,
+                description=descriptions[project_rate.pk],
                 unit_price=project_rate.rate,
                 quantity=total,
                 vat_percentage=project_rate.vat_percentage,
@@ -126,17 +179,22 @@ class Command(BaseCommand):
             items.append(item)
         return items
 
-    def _convert_hours_to_total(self, project_rate: Rate, total_hours: float):
-        """Convert total hours to the total amount based on the rate type."""
+    def _convert_hours_to_total(self, project_rate: Rate, total_hours: float) -> Decimal:
+        """Convert total hours to the total amount based on the rate type.
+
+        The worked hours are stored as floats, they are converted to a Decimal from their shortest representation so
+        the quantity of the invoice item is not affected by binary rounding errors.
+        """
+        hours = Decimal(str(total_hours))
         match project_rate.rate_type:
             case project_rate.RateType.HOURLY:
-                total = total_hours
+                total = hours
             case project_rate.RateType.DAILY:
-                total = total_hours / 8
+                total = hours / HOURS_PER_DAY
             case project_rate.RateType.MONTHLY:
-                total = 1.0
+                total = Decimal(1)
             case _:
-                total = 0.0
+                total = Decimal(0)
 
         return total
 
@@ -1,5 +1,6 @@
 """Django command to create timesheets for active projects."""
 
+from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
@@ -33,34 +34,48 @@ class Command(BaseCommand):
         return self._create_timesheets(project_id, month, year, user_id)
 
     def _create_timesheets(self, project_id: int, month: int, year: int, user_id: int):
+        if not 1 <= month <= 12:
+            raise CommandError(f"Month must be between 1 and 12, got {month}.")
         projects = self._get_projects(project_id)
-        zfilled_month = str(month).zfill(2)
+        user = self._get_user(user_id) if user_id else None
+        zfilled_month = f"{month:02d}"
         for project in projects:
-            if not user_id:
-                user_ids = project.users.values_list("id", flat=True)
-            else:
-                user_ids = [user_id]
-            for user_id in user_ids:
-                timesheet, created = Timesheet.objects.get_or_create(
-                    project=project,
-                    month=month,
-                    year=year,
-                    user_id=user_id,
+            users = [user] if user else list(project.users.all())
+            existing_user_ids = set(
+                Timesheet.objects.filter(project=project, month=month, year=year, user__in=users).values_list(
+                    "user_id", flat=True
                 )
+            )
+            # The validation of Timesheet.save is not needed: the month is checked above and the user and project exist.
+            Timesheet.objects.bulk_create(
+                [
+                    Timesheet(project=project, month=month, year=year, user=user_)
+                    for user_ in users
+                    if user_.pk not in existing_user_ids
+                ],
+                ignore_conflicts=True,
+            )
+            for user_ in users:
+                created = user_.pk not in existing_user_ids
                 action = "created" if created else "already exists"
-                msg = f"Timesheet {action} for user {timesheet.user} on project {project} in {zfilled_month}/{year}."
+                msg = f"Timesheet {action} for user {user_} on project {project} in {zfilled_month}/{year}."
                 if not created:
                     self.stdout.write(self.style.WARNING(msg))
                 else:
                     self.stdout.write(self.style.SUCCESS(msg))
 
+    def _get_user(self, user_id: int):
+        try:
+            return get_user_model().objects.get(pk=user_id)
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"User with id {user_id} does not exist.") from exc
+
     def _get_projects(self, project_id: int):
+        projects = Project.objects.defer("description").prefetch_related("users")
         if project_id:
             try:
-                project = Project.objects.get(pk=project_id)
+                project = projects.get(pk=project_id)
             except Project.DoesNotExist as exc:
                 raise CommandError(f"Project with id {project_id} does not exist.") from exc
-            projects = [project]
-        else:
-            projects = Project.objects.all()
+            return [project]
         return projects
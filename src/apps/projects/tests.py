@@ -7,9 +7,8 @@ from django.core.management import call_command
 from django.core.management.base import CommandError
 from django.test import TestCase
 
-from apps.companies.models import Company
+from apps.invoices.models import Invoice
 from apps.projects.models import Project, Rate
-from apps.relations.models import Relation
 from apps.timesheets.models import Timesheet, TimesheetItem
 
 
@@ -21,7 +20,9 @@ class ProjectsTests(TestCase):
     @classmethod
     def setUpTestData(cls):
         """Set up the test data."""
-        cls.project = Project.objects.get(pk=1)
+        cls.project = (
+            Project.objects.select_related("relation", "company").prefetch_related("users", "rate_set").get(pk=1)
+        )
         cls.user = get_user_model().objects.get(pk=1)
 
     def test_model_content(self):
@@ -31,11 +32,11 @@ class ProjectsTests(TestCase):
         self.assertEqual(str(self.project.start_date), "2025-01-01")
         self.assertEqual(str(self.project.end_date), "2025-12-31")
         self.assertTrue(self.project.users.contains(self.user))  # type: ignore
-        self.assertEqual(self.project.relation, Relation.objects.get(pk=1))
-        self.assertEqual(self.project.company, Company.objects.get(pk=1))
+        self.assertEqual(self.project.relation.pk, 1)
+        self.assertEqual(self.project.company.pk, 1)
         self.assertEqual(self.project.invoice_line_prefix, "Dummy Prefix")
-        for rate in Rate.objects.all():
-            self.assertTrue(self.project.rate_set.contains(rate))
+        all_rate_ids = set(Rate.objects.values_list("pk", flat=True))
+        self.assertEqual({rate.pk for rate in self.project.rate_set.all()}, all_rate_ids)
 
     def test_str(self):
         """Test the string representation."""
@@ -67,6 +68,7 @@ class ProjectsTests(TestCase):
         out = StringIO()
         call_command("createinvoices", month=1, year=2025, stdout=out)
         self.assertIn("No invoice items created", out.getvalue())
+        self.assertFalse(Invoice.objects.exists())
 
         timesheet.timesheetitem_set.create(
             item_type=TimesheetItem.ItemType.STANDARD,
@@ -74,8 +76,69 @@ class ProjectsTests(TestCase):
             worked_hours=8.0,
             description="Worked on project tasks",
         )
-        timesheet.status = Timesheet.Status.COMPLETED
-        timesheet.save()
         out = StringIO()
-        call_command("createinvoices", month=1, year=2025, stdout=out)
+        with self.assertNumQueries(11):
+            call_command("createinvoices", month=1, year=2025, stdout=out)
         self.assertIn("Created invoice for Dummy Project - Dummy User - 01/2025.", out.getvalue())
+        invoice = Invoice.objects.get()
+        self.assertEqual(str(invoice.date), "2025-01-31")
+        self.assertEqual(invoice.invoiceitem_set.get().description, "[Dummy Prefix] Standard (Daily)")
+        self.assertEqual((invoice.subtotal, invoice.vat_amount, invoice.total), (500, 105, 605))
+
+    def test_createinvoices_without_rates(self):
+        """Test that the createinvoices management command skips projects without rates."""
+        project = Project.objects.create(
+            name="Project without rates",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            relation=self.project.relation,
+            company=self.project.company,
+            invoice_line_prefix="No rates",
+        )
+        out = StringIO()
+        call_command("createinvoices", project_id=project.pk, month=1, year=2025, stdout=out)
+        self.assertEqual(out.getvalue(), "No rates found for project Project without rates.\n")
+
+    def test_createtimesheets(self):
+        """Test the createtimesheets management command."""
+        with self.assertRaises(CommandError) as cm:
+            call_command("createtimesheets", month=13, year=2025, stdout=StringIO())
+        self.assertIn("Month must be between 1 and 12, got 13.", str(cm.exception))
+
+        with self.assertRaises(CommandError) as cm:
+            call_command("createtimesheets", user_id=999, month=2, year=2025, stdout=StringIO())
+        self.assertIn("User with id 999 does not exist.", str(cm.exception))
+
+        out = StringIO()
+        call_command("createtimesheets", month=2, year=2025, stdout=out)
+        self.assertIn(f"Timesheet created for user {self.user} on project Dummy Project in 02/2025.", out.getvalue())
+        timesheet = Timesheet.objects.get(project=self.project, user=self.user, month=2, year=2025)
+        self.assertEqual(timesheet.status, Timesheet.Status.DRAFT)
+
+        out = StringIO()
+        call_command(
+            "createtimesheets", project_id=self.project.pk, user_id=self.user.pk, month=2, year=2025, stdout=out
+        )
+        self.assertIn("Timesheet already exists", out.getvalue())
+        self.assertEqual(Timesheet.objects.filter(month=2, year=2025).count(), 1)
+
+    def test_createinvoices_continues_after_project_without_timesheets(self):
+        """Test that a project without completed timesheets does not stop the createinvoices management command."""
+        project = Project.objects.create(
+            name="Another project",
+            start_date="2025-01-01",
+            end_date="2025-12-31",
+            relation=self.project.relation,
+            company=self.project.company,
+            invoice_line_prefix="Another",
+        )
+        project.rate_set.create(item_type=TimesheetItem.ItemType.STANDARD, rate_type=Rate.RateType.HOURLY, rate=50)
+        timesheet = Timesheet.objects.create(
+            user=self.user, project=project, month=1, year=2025, status=Timesheet.Status.COMPLETED
+        )
+        timesheet.timesheetitem_set.create(item_type=TimesheetItem.ItemType.STANDARD, date="2025-01-01", worked_hours=2)
+
+        out = StringIO()
+        call_command("createinvoices", month=1, year=2025, stdout=out)
+        self.assertIn("No completed timesheets found", out.getvalue())
+        self.assertIn("Created invoice for Another project - Dummy User - 01/2025.", out.getvalue())
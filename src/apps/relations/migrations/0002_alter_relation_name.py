@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='relation',
+            name='name',
+            field=models.CharField(db_index=True, max_length=255, verbose_name='name'),
+        ),
+    ]
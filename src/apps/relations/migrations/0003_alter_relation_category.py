@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relations', '0002_alter_relation_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='relation',
+            name='category',
+            field=models.CharField(choices=[('CUSTOMER', 'Customer'), ('SUPPLIER', 'Supplier')], db_index=True, max_length=50, verbose_name='category'),
+        ),
+    ]
@@ -23,8 +23,8 @@ class Relation(models.Model):
         CUSTOMER = "CUSTOMER", _("Customer")
         SUPPLIER = "SUPPLIER", _("Supplier")
 
-    name = models.CharField(verbose_name=_("name"), max_length=255)
-    category = models.CharField(verbose_name=_("category"), max_length=50, choices=Category.choices)
+    name = models.CharField(verbose_name=_("name"), max_length=255, db_index=True)
+    category = models.CharField(verbose_name=_("category"), max_length=50, choices=Category.choices, db_index=True)
     language = models.CharField(verbose_name=_("language"), max_length=10, default="en", choices=settings.LANGUAGES)
     phone = models.CharField(
         verbose_name=_("phone"),
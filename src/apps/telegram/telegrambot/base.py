@@ -1,8 +1,13 @@
 """Base telegram settings."""
 
-from abc import ABC
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from copy import deepcopy
+from typing import Any
 
 from django_telegram_app.bot.base import BaseBotCommand, Step
+from django_telegram_app.models import CallbackData
 
 from apps.telegram.models import TelegramSettings
 
@@ -11,6 +16,76 @@ class TelegramCommand(BaseBotCommand, ABC):
     """Project specific base class for telegram commands."""
 
     settings: TelegramSettings
+    _steps: list["TelegramStep"] | None = None
+    _pending_callbacks: list[CallbackData] | None = None
+
+    def __init__(self, settings: TelegramSettings):
+        """Initialize the command with an empty callback data cache."""
+        super().__init__(settings)
+        self._callback_data: dict[str, dict[str, Any]] = {}
+
+    @property
+    def steps(self) -> list["TelegramStep"]:
+        """Return the steps of the command.
+
+        The steps are built once per command instance, since the base command looks them up on every navigation.
+        """
+        if self._steps is None:
+            self._steps = self.get_steps()
+        return self._steps
+
+    def create_callback(self, step_name: str, action: str, **kwargs):
+        """Create callback data for the current command and return the token.
+
+        Inside `bulk_callbacks` the callback is only built here and inserted when the block exits.
+        """
+        if self._pending_callbacks is None:
+            return super().create_callback(step_name, action, **kwargs)
+        if "correlation_key" not in kwargs:
+            kwargs.update(self._get_default_callback_data())
+        callback_data = CallbackData(command=self.get_command_string(), step=step_name, action=action, data=kwargs)
+        self._pending_callbacks.append(callback_data)
+        return str(callback_data.token)
+
+    @contextmanager
+    def bulk_callbacks(self) -> Iterator[None]:
+        """Insert the callbacks created in the block with a single query when it exits.
+
+        Use this around building a keyboard, so every button does not need its own INSERT. The tokens are generated
+        up front, but the callbacks cannot be read back before the block exits.
+        """
+        if self._pending_callbacks is not None:
+            yield
+            return
+        self._pending_callbacks = []
+        try:
+            yield
+            CallbackData.objects.bulk_create(self._pending_callbacks)
+        finally:
+            self._pending_callbacks = None
+
+    def get_callback_data(self, callback_token: str) -> dict[str, Any]:
+        """Return a copy of the callback data for the given token.
+
+        Each token is loaded at most once per command instance. The dispatcher, the navigation methods and the steps
+        all read the data of the same callback while handling a single update.
+        """
+        if not callback_token:
+            return super().get_callback_data(callback_token)
+        if callback_token not in self._callback_data:
+            self._callback_data[callback_token] = super().get_callback_data(callback_token)
+        return deepcopy(self._callback_data[callback_token])
+
+    def _clear_state(self):
+        """Clear the command state, skipping the update when there is no state to clear."""
+        if not self.settings.data:
+            return
+        self.settings.data = {}
+        self.settings.save(update_fields=["data", "updated_at"])
+
+    @abstractmethod
+    def get_steps(self) -> list["TelegramStep"]:
+        """Return a new list with the steps of the command."""
 
 
 class TelegramStep(Step, ABC):
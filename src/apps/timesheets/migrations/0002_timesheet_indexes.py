@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-16 15:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('timesheets', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timesheet',
+            index=models.Index(fields=['project', 'year', 'month', 'status'], name='timesheet_project_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timesheet',
+            index=models.Index(fields=['user', 'status'], name='timesheet_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timesheetitem',
+            index=models.Index(fields=['timesheet', 'item_type'], name='timesheetitem_type_idx'),
+        ),
+    ]
@@ -46,15 +46,24 @@ class Timesheet(models.Model):
     user = models.ForeignKey("users.IdaUser", on_delete=models.CASCADE, verbose_name=_("user"))
     project = models.ForeignKey("projects.Project", on_delete=models.CASCADE, verbose_name=_("project"))
 
-    def save(self, *args, **kwargs):
-        """Override save method to ensure full_clean is called."""
-        self.full_clean()
+    def save(self, *args, skip_validation: bool = False, **kwargs):
+        """Override save method to ensure full_clean is called.
+
+        Callers that only change fields to values known to be valid can pass `skip_validation=True` to avoid the
+        field validation and the unique_together lookup done by full_clean.
+        """
+        if not skip_validation:
+            self.full_clean()
         return super().save(*args, **kwargs)
 
     class Meta:
         """Set meta options."""
 
         unique_together = ("user", "project", "month", "year")
+        indexes = [
+            models.Index(fields=["project", "year", "month", "status"], name="timesheet_project_period_idx"),
+            models.Index(fields=["user", "status"], name="timesheet_user_status_idx"),
+        ]
 
     @property
     def name(self):
@@ -64,19 +73,31 @@ class Timesheet(models.Model):
             user_name = f"{user_name} {self.user.last_name}"
         if not user_name:
             user_name = self.user.username
-        return f"{self.project} - {user_name} - {str(self.month).zfill(2)}/{self.year}"
+        return f"{self.project} - {user_name} - {self.month:02d}/{self.year}"
 
     def get_missing_days(self) -> list[date]:
-        """Return the dates for the standard days missing in the timesheet."""
+        """Return the dates for the standard days missing in the timesheet.
+
+        When the timesheet items are prefetched, they are used instead of querying the existing days.
+        """
         if self.status == self.Status.COMPLETED:
             return []
 
         nb_of_days = self._get_number_of_days()
 
         days = range(1, nb_of_days + 1)
-        existing_days = self.timesheetitem_set.filter(item_type=TimesheetItem.ItemType.STANDARD).values_list(
-            "date__day", flat=True
-        )
+        if "timesheetitem_set" in getattr(self, "_prefetched_objects_cache", {}):
+            existing_days = {
+                item.date.day
+                for item in self.timesheetitem_set.all()
+                if item.item_type == TimesheetItem.ItemType.STANDARD
+            }
+        else:
+            existing_days = set(
+                self.timesheetitem_set.filter(item_type=TimesheetItem.ItemType.STANDARD).values_list(
+                    "date__day", flat=True
+                )
+            )
 
         return self._get_missing_dates(days, existing_days)
 
@@ -111,7 +132,7 @@ class Timesheet(models.Model):
         if self.status == self.Status.COMPLETED:
             return
         self.status = self.Status.COMPLETED
-        self.save()
+        self.save(skip_validation=True, update_fields=["status"])
 
     def get_overview(self, include_details: bool = False) -> str:
         """Return an overview of the timesheet.
@@ -192,6 +213,11 @@ class TimesheetItem(models.Model):
     worked_hours = models.FloatField(verbose_name=_("worked hours"))
     description = models.TextField(verbose_name=_("description"), blank=True)
 
+    class Meta:
+        """Set meta options."""
+
+        indexes = [models.Index(fields=["timesheet", "item_type"], name="timesheetitem_type_idx")]
+
     def __str__(self):
         """Return the string representation of the timesheet item."""
         timesheet_item = f"{self.date} - {self.get_item_type_display()} - {self.worked_hours} hours"
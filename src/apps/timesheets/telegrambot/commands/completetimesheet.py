@@ -9,7 +9,6 @@ class Command(TelegramCommand):
 
     description = "Mark a timesheet as completed"
 
-    @property
-    def steps(self):
+    def get_steps(self):
         """Return the steps of the command."""
         return [SelectTimesheet(self), Confirm(self, steps_back=1), MarkTimesheetAsCompleted(self)]
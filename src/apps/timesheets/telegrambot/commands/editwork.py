@@ -9,7 +9,6 @@ class Command(TelegramCommand):
 
     description = "Edit previously registered working hours"
 
-    @property
-    def steps(self):
+    def get_steps(self):
         """Return the steps of the command."""
         return [SelectExistingDay(self), SelectWorkedHours(self, steps_back=1), EditWorkedHours(self)]
@@ -18,8 +18,7 @@ class Command(TelegramCommand):
 
     description = "Register overtime for a specific day on a specific project."
 
-    @property
-    def steps(self):
+    def get_steps(self):
         """Return the steps of the command."""
         return [
             SelectProject(self),
@@ -9,7 +9,6 @@ class Command(TelegramCommand):
 
     description = "Register working hours for a specific day on a specific project."
 
-    @property
-    def steps(self):
+    def get_steps(self):
         """Return the steps of the command."""
         return [SelectMissingDay(self), SelectWorkedHours(self, steps_back=1), RegisterWorkedHours(self)]
@@ -9,8 +9,7 @@ class Command(TelegramCommand):
 
     description = "Request an overview of a timesheet and its items."
 
-    @property
-    def steps(self):
+    def get_steps(self):
         """Return the steps of the command."""
         return [
             SelectTimesheet(self, filter_kwargs={"user": self.settings.user}),
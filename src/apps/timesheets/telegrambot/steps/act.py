@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import TYPE_CHECKING
 
 from django.core.exceptions import ValidationError
@@ -55,7 +55,9 @@ class CombineDateTime(TelegramStep):
             normalized_time_str = time_str
 
         try:
-            return datetime.strptime(normalized_time_str, "%H:%M").time()
+            if len(normalized_time_str) != 5 or normalized_time_str[2] != ":":
+                raise ValueError(f"Invalid time format: {normalized_time_str!r}")
+            return time.fromisoformat(normalized_time_str)
         except ValueError as exc:
             send_message("Invalid time format. Please use HH:MM.", self.command.settings.chat_id)
             raise exc
@@ -301,7 +303,7 @@ class RegisterWorkedHours(TelegramStep):
         """Register work hours for the given date and option."""
         assert data["start_date"], "Start date must be set."
         start_date = date.fromisoformat(data["start_date"])
-        timesheet = Timesheet.objects.get(
+        timesheet = Timesheet.objects.only("id").get(
             status=Timesheet.Status.DRAFT,
             month=start_date.month,
             year=start_date.year,
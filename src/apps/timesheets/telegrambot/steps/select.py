@@ -10,6 +10,7 @@ import logging
 from datetime import date, datetime
 from typing import TYPE_CHECKING
 
+from django.db.models import Prefetch
 from django.utils import timezone
 from django.utils.translation import gettext
 from django_telegram_app.bot.bot import DO_NOTHING, send_message
@@ -24,6 +25,9 @@ if TYPE_CHECKING:
 
     from apps.telegram.telegrambot.base import TelegramCommand
 
+DAYS_PER_PAGE = 4
+WORKED_HOURS_OPTIONS = (("Full day (8h)", 8), ("Half day (4h)", 4), ("Holiday (0h)", 0))
+
 
 class SelectDate(TelegramStep):
     """Represent the date selection step in a Telegram bot command."""
@@ -49,32 +53,33 @@ class SelectDate(TelegramStep):
 
         prev_kw = {self.key: self._get_previous_display_date(display_date)}
         next_kw = {self.key: self._get_next_display_date(display_date)}
-        keyboard = []
-        header = [
-            {"text": "<<", "callback_data": self.current_step_callback(data, **prev_kw)},
-            {"text": f"{str(display_date.month).zfill(2)}/{display_date.year}", "callback_data": DO_NOTHING},
-            {"text": ">>", "callback_data": self.current_step_callback(data, **next_kw)},
-        ]
-        keyboard.append(header)
-
-        days_of_week = [{"text": gettext(day), "callback_data": DO_NOTHING} for day in calendar.day_abbr]
-        keyboard.append(days_of_week)
-
-        for week in calendar.monthcalendar(display_date.year, display_date.month):
-            row = []
-            for day in week:
-                if not day:
-                    row.append({"text": " ", "callback_data": DO_NOTHING})
-                    continue
-                selected_date = date(display_date.year, display_date.month, day)
-                text = str(day).zfill(2)
-                if selected_date == now.date():
-                    text = f"({text})"
-                kwargs = {self.key: selected_date}
-                row.append({"text": text, "callback_data": self.next_step_callback(data, **kwargs)})
-            keyboard.append(row)
-
-        self.maybe_add_previous_button(keyboard, data)
+        with self.command.bulk_callbacks():
+            keyboard = []
+            header = [
+                {"text": "<<", "callback_data": self.current_step_callback(data, **prev_kw)},
+                {"text": f"{str(display_date.month).zfill(2)}/{display_date.year}", "callback_data": DO_NOTHING},
+                {"text": ">>", "callback_data": self.current_step_callback(data, **next_kw)},
+            ]
+            keyboard.append(header)
+
+            days_of_week = [{"text": gettext(day), "callback_data": DO_NOTHING} for day in calendar.day_abbr]
+            keyboard.append(days_of_week)
+
+            for week in calendar.monthcalendar(display_date.year, display_date.month):
+                row = []
+                for day in week:
+                    if not day:
+                        row.append({"text": " ", "callback_data": DO_NOTHING})
+                        continue
+                    selected_date = date(display_date.year, display_date.month, day)
+                    text = str(day).zfill(2)
+                    if selected_date == now.date():
+                        text = f"({text})"
+                    kwargs = {self.key: selected_date}
+                    row.append({"text": text, "callback_data": self.next_step_callback(data, **kwargs)})
+                keyboard.append(row)
+
+            self.maybe_add_previous_button(keyboard, data)
 
         reply_markup = {"inline_keyboard": keyboard}
         send_message(
@@ -120,22 +125,23 @@ class SelectDay(TelegramStep):
 
     def handle(self, telegram_update: "TelegramUpdate"):
         """Show the day selection to the user."""
-        days = self.get_days()
-        if not days:
+        data = self.get_callback_data(telegram_update)
+        current_page: int = data.get("current_page", 1)
+        start = (current_page - 1) * DAYS_PER_PAGE
+        end = start + DAYS_PER_PAGE
+        # One day more than fits on the page is fetched, to know whether there is a next page.
+        days = self.get_days(start, end + 1)
+        if not days and current_page == 1:
             msg = f"No days found. Unable to complete {self.command.get_name()}."
             send_message(msg, telegram_update.chat_id)
             return self.command.finish(self.name, telegram_update)
 
-        data = self.get_callback_data(telegram_update)
-        current_page: int = data.get("current_page", 1)
-        start = (current_page - 1) * 4
-        end = start + 4
-
-        keyboard = self.get_keyboard(days, data, start, end)
+        with self.command.bulk_callbacks():
+            keyboard = self.get_keyboard(days[:DAYS_PER_PAGE], data)
 
-        self._maybe_add_pagination_buttons(keyboard, days, data, current_page, end)
+            self._maybe_add_pagination_buttons(keyboard, len(days) > DAYS_PER_PAGE, data, current_page)
 
-        self.maybe_add_previous_button(keyboard, data)
+            self.maybe_add_previous_button(keyboard, data)
 
         reply_markup = {"inline_keyboard": keyboard}
         send_message(
@@ -145,19 +151,19 @@ class SelectDay(TelegramStep):
             message_id=telegram_update.message_id,
         )
 
-    def get_days(self):
-        """Get the days to be displayed."""
+    def get_days(self, start: int, end: int):
+        """Get the days from start up to end to be displayed."""
         raise NotImplementedError("Subclasses must implement this method")
 
-    def get_keyboard(self, days: list[tuple], data: dict, start: int, end: int):
+    def get_keyboard(self, days: list[tuple], data: dict):
         """Get the keyboard for the given days and data."""
         raise NotImplementedError("Subclasses must implement this method")
 
-    def _maybe_add_pagination_buttons(self, keyboard: list, days: list, data: dict, current_page: int, end: int):
+    def _maybe_add_pagination_buttons(self, keyboard: list, has_next_page: bool, data: dict, current_page: int):
         if current_page > 1:
             callback_back = self.current_step_callback(data, current_page=current_page - 1)
             keyboard.append([{"text": "⬅️ Back", "callback_data": callback_back}])
-        if len(days) > end:
+        if has_next_page:
             callback_next = self.current_step_callback(data, current_page=current_page + 1)
             keyboard.append([{"text": "➡️ Next", "callback_data": callback_next}])
 
@@ -165,23 +171,26 @@ class SelectDay(TelegramStep):
 class SelectExistingDay(SelectDay):
     """Represent the existing day selection step in a Telegram bot command."""
 
-    def get_days(self):
-        """Get the existing days for the settings' user's project.
+    def get_days(self, start: int, end: int):
+        """Get the existing days from start up to end for the settings' user's project.
 
-        This is sorted by most recent date first.
+        This is sorted by most recent date first. Only the requested days are loaded from the database.
         """
-        draft_timesheets = Timesheet.objects.filter(status=Timesheet.Status.DRAFT, user=self.command.settings.user)
-        existing = [
-            (timesheet.project, item)
-            for timesheet in draft_timesheets
-            for item in timesheet.timesheetitem_set.filter(item_type=TimesheetItem.ItemType.STANDARD)
-        ]
-        return sorted(existing, key=lambda x: x[1].date, reverse=True)
-
-    def get_keyboard(self, days: list[tuple[Project, TimesheetItem]], data: dict, start: int, end: int):
+        items = (
+            TimesheetItem.objects.filter(
+                timesheet__status=Timesheet.Status.DRAFT,
+                timesheet__user=self.command.settings.user,
+                item_type=TimesheetItem.ItemType.STANDARD,
+            )
+            .select_related("timesheet__project")
+            .order_by("-date", "timesheet", "pk")[start:end]
+        )
+        return [(item.timesheet.project, item) for item in items]
+
+    def get_keyboard(self, days: list[tuple[Project, TimesheetItem]], data: dict):
         """Get the keyboard for the given days and data."""
         keyboard = []
-        for project, item in days[start:end]:
+        for project, item in days:
             callback_next = self.next_step_callback(
                 data, start_date=item.date, project_id=project.pk, project_name=project.name, item_pk=item.pk
             )
@@ -197,23 +206,26 @@ class SelectItemType(TelegramStep):
     def handle(self, telegram_update: "TelegramUpdate"):
         """Show the item type selection to the user."""
         data = self.get_callback_data(telegram_update)
-        keyboard = []
-        for item_type in TimesheetItem.ItemType:
-            item_label = str(item_type.label)  # Needs str cast for lazy translation objects
-            next_callback = self.next_step_callback(data, item_type=item_type.value, item_type_label=item_type.label)
-            keyboard.append([{"text": item_label, "callback_data": next_callback}])
-
-        # Add the infer item type
-        keyboard.append(
-            [
-                {
-                    "text": "Inferred",
-                    "callback_data": self.next_step_callback(data, item_type=0, item_type_label="Inferred"),
-                }
-            ]
-        )
+        with self.command.bulk_callbacks():
+            keyboard = []
+            for item_type in TimesheetItem.ItemType:
+                item_label = str(item_type.label)  # Needs str cast for lazy translation objects
+                next_callback = self.next_step_callback(
+                    data, item_type=item_type.value, item_type_label=item_type.label
+                )
+                keyboard.append([{"text": item_label, "callback_data": next_callback}])
+
+            # Add the infer item type
+            keyboard.append(
+                [
+                    {
+                        "text": "Inferred",
+                        "callback_data": self.next_step_callback(data, item_type=0, item_type_label="Inferred"),
+                    }
+                ]
+            )
 
-        self.maybe_add_previous_button(keyboard, data)
+            self.maybe_add_previous_button(keyboard, data)
 
         send_message(
             "Select the item type:",
@@ -229,19 +241,29 @@ class SelectMissingDay(SelectDay):
     This shows only the days in the past that are missing from the timesheet.
     """
 
-    def get_days(self):
-        """Get the missing days for the settings' user's project."""
+    def get_days(self, start: int, end: int):
+        """Get the missing days from start up to end for the settings' user's project.
+
+        The missing days are derived from the registered days in Python, so they are all computed for every page.
+        """
         now = timezone.now().date()
-        draft_timesheets = Timesheet.objects.filter(
-            status=Timesheet.Status.DRAFT, user=self.command.settings.user, year__lte=now.year, month__lte=now.month
+        standard_items = TimesheetItem.objects.filter(item_type=TimesheetItem.ItemType.STANDARD).only(
+            "timesheet", "item_type", "date"
+        )
+        draft_timesheets = (
+            Timesheet.objects.filter(
+                status=Timesheet.Status.DRAFT, user=self.command.settings.user, year__lte=now.year, month__lte=now.month
+            )
+            .select_related("project")
+            .prefetch_related(Prefetch("timesheetitem_set", queryset=standard_items))
         )
         missing = [(timesheet.project, date) for timesheet in draft_timesheets for date in timesheet.get_missing_days()]
-        return sorted(missing, key=lambda x: x[1])
+        return sorted(missing, key=lambda x: x[1])[start:end]
 
-    def get_keyboard(self, days: list[tuple[Project, date]], data: dict, start: int, end: int):
+    def get_keyboard(self, days: list[tuple[Project, date]], data: dict):
         """Get the keyboard for the given days and data."""
         keyboard = []
-        for project, day in days[start:end]:
+        for project, day in days:
             callback_day = self.next_step_callback(
                 data, start_date=day, project_id=project.pk, project_name=project.name
             )
@@ -254,29 +276,30 @@ class SelectOverviewType(TelegramStep):
 
     def handle(self, telegram_update: "TelegramUpdate"):
         """Show the overview type selection to the user."""
-        logging.info(f"Handling {self.name} step for user {self.command.settings.user}: {telegram_update}")
+        logging.info("Handling %s step for user %s: %s", self.name, self.command.settings.user, telegram_update)
         data = self.get_callback_data(telegram_update)
-        keyboard = [
-            [
-                {
-                    "text": "Summary Overview",
-                    "callback_data": self.next_step_callback(data, overview_type=OverviewType.SUMMARY.value),
-                }
-            ],
-            [
-                {
-                    "text": "Detailed Overview",
-                    "callback_data": self.next_step_callback(data, overview_type=OverviewType.DETAILED.value),
-                }
-            ],
-            [
-                {
-                    "text": "Holidays Overview",
-                    "callback_data": self.next_step_callback(data, overview_type=OverviewType.HOLIDAYS.value),
-                }
-            ],
-        ]
-        self.maybe_add_previous_button(keyboard, data)
+        with self.command.bulk_callbacks():
+            keyboard = [
+                [
+                    {
+                        "text": "Summary Overview",
+                        "callback_data": self.next_step_callback(data, overview_type=OverviewType.SUMMARY.value),
+                    }
+                ],
+                [
+                    {
+                        "text": "Detailed Overview",
+                        "callback_data": self.next_step_callback(data, overview_type=OverviewType.DETAILED.value),
+                    }
+                ],
+                [
+                    {
+                        "text": "Holidays Overview",
+                        "callback_data": self.next_step_callback(data, overview_type=OverviewType.HOLIDAYS.value),
+                    }
+                ],
+            ]
+            self.maybe_add_previous_button(keyboard, data)
 
         send_message(
             "Which type of overview would you like to see?",
@@ -308,12 +331,13 @@ class SelectProject(TelegramStep):
             telegram_update.callback_data = callback_next
             return self.command.next_step(self.name, telegram_update)
 
-        keyboard = []
-        for project in projects:
-            callback_next = self.next_step_callback(data, project_id=project.pk, project_name=str(project))
-            keyboard.append([{"text": str(project), "callback_data": callback_next}])
+        with self.command.bulk_callbacks():
+            keyboard = []
+            for project in projects:
+                callback_next = self.next_step_callback(data, project_id=project.pk, project_name=str(project))
+                keyboard.append([{"text": str(project), "callback_data": callback_next}])
 
-        self.maybe_add_previous_button(keyboard, data)
+            self.maybe_add_previous_button(keyboard, data)
 
         send_message(
             "Select a project:",
@@ -341,8 +365,10 @@ class SelectTimesheet(TelegramStep):
 
     def handle(self, telegram_update: "TelegramUpdate"):
         """Show the timesheet selection to the user."""
-        logging.info(f"Handling {self.name} step for user {self.command.settings.user}")
-        timesheets = Timesheet.objects.filter(**self.filter_kwargs).order_by(*self.order_by)
+        logging.info("Handling %s step for user %s", self.name, self.command.settings.user)
+        timesheets = (
+            Timesheet.objects.filter(**self.filter_kwargs).select_related("user", "project").order_by(*self.order_by)
+        )
         if not timesheets:
             error_message = "No timesheets found."
             send_message(error_message, self.command.settings.chat_id, message_id=telegram_update.message_id)
@@ -355,12 +381,13 @@ class SelectTimesheet(TelegramStep):
             telegram_update.callback_data = next_callback
             return self.command.next_step(self.name, telegram_update)
 
-        keyboard = []
-        for timesheet in timesheets:
-            next_callback = self.next_step_callback(data, timesheet_id=timesheet.pk, timesheet_name=str(timesheet))
-            keyboard.append([{"text": str(timesheet), "callback_data": next_callback}])
+        with self.command.bulk_callbacks():
+            keyboard = []
+            for timesheet in timesheets:
+                next_callback = self.next_step_callback(data, timesheet_id=timesheet.pk, timesheet_name=str(timesheet))
+                keyboard.append([{"text": str(timesheet), "callback_data": next_callback}])
 
-        self.maybe_add_previous_button(keyboard, data)
+            self.maybe_add_previous_button(keyboard, data)
 
         send_message(
             "Select a timesheet:",
@@ -376,12 +403,12 @@ class SelectWorkedHours(TelegramStep):
     def handle(self, telegram_update):
         """Show the hours worked selection to the user."""
         data = self.get_callback_data(telegram_update)
-        options = {"Full day (8h)": 8, "Half day (4h)": 4, "Holiday (0h)": 0}
-        keyboard = []
-        for key, value in options.items():
-            keyboard.append([{"text": key, "callback_data": self.next_step_callback(data, duration=value)}])
+        with self.command.bulk_callbacks():
+            keyboard = []
+            for key, value in WORKED_HOURS_OPTIONS:
+                keyboard.append([{"text": key, "callback_data": self.next_step_callback(data, duration=value)}])
 
-        self.maybe_add_previous_button(keyboard, data)
+            self.maybe_add_previous_button(keyboard, data)
 
         reply_markup = {"inline_keyboard": keyboard}
         send_message(
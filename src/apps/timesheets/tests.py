@@ -53,6 +53,10 @@ class TimesheetsTests(TestCase):
         missing_days = self.timesheet.get_missing_days()
         self.assertEqual(len(missing_days), 20)
 
+        timesheet = Timesheet.objects.prefetch_related("timesheetitem_set").get(pk=self.timesheet.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(timesheet.get_missing_days(), missing_days)
+
     def test_str(self):
         """Test the string representation."""
         self.assertEqual(str(self.timesheet), "Dummy Project - Dummy User - 01/2025")
@@ -64,6 +68,13 @@ class TimesheetsTests(TestCase):
         timesheet_item = self.timesheet.timesheetitem_set.filter(item_type=TimesheetItem.ItemType.NIGHT).first()
         self.assertEqual(str(timesheet_item), "2025-01-03 - Night - 2.0 hours")
 
+    def test_mark_as_completed_skips_validation(self):
+        """Test that marking a timesheet as completed only updates its status."""
+        with self.assertNumQueries(1):
+            self.timesheet.mark_as_completed()
+        self.timesheet.refresh_from_db()
+        self.assertEqual(self.timesheet.status, Timesheet.Status.COMPLETED)
+
     def test_timesheet_unique_together(self):
         """Test the unique together constraint."""
         self.timesheet.mark_as_completed()
@@ -160,6 +171,16 @@ class TimesheetsTelegramBotTestCase(TelegramBotTestCase):
             self.click_on_text("Full day (8h)")
             self.assertEqual(self.timesheet.timesheetitem_set.count(), existing_timesheet_items + 1)
 
+            self.send_text("/registerwork")
+            self.assertNotIn("Dummy Project: 2025-01-03", self.available_button_texts)
+
+            # A day registered while paging is no longer counted on the following pages.
+            self.click_on_text("➡️ Next")
+            self.assertEqual(self.available_button_texts, ["Dummy Project: 2025-01-13", "⬅️ Back"])
+            self.timesheet.timesheetitem_set.create(date=datetime(2025, 1, 13).date(), worked_hours=8)
+            self.click_on_text("⬅️ Back")
+            self.assertNotIn("➡️ Next", self.available_button_texts)
+
     def test_telegram_editwork(self):
         """Test the telegram editwork command."""
         existing_timesheet_items = self.timesheet.timesheetitem_set.count()
@@ -250,6 +271,28 @@ class TimesheetsTelegramBotTestCase(TelegramBotTestCase):
         timesheet_0.refresh_from_db()  # The instance is updated indirectly, so we refresh it.
         self.assertEqual(timesheet_0.status, Timesheet.Status.COMPLETED)
 
+    def test_command_steps_are_built_once(self):
+        """Test that a command builds its steps once and reuses them while navigating."""
+        registerwork_cmd = load_command_class(get_commands()["registerwork"], "registerwork", self.telegram_setting)
+        self.assertIs(registerwork_cmd.steps, registerwork_cmd.steps)
+        self.assertEqual(len(registerwork_cmd.steps), 3)
+
+    def test_command_loads_callback_data_once(self):
+        """Test that a command loads the data of a callback token once and hands out copies."""
+        registerwork_cmd = load_command_class(get_commands()["registerwork"], "registerwork", self.telegram_setting)
+        token = registerwork_cmd.create_callback("selectmissingday", "next_step", duration=8)
+        with self.assertNumQueries(1):
+            data = registerwork_cmd.get_callback_data(token)
+            data.pop("duration")
+            self.assertEqual(registerwork_cmd.get_callback_data(token)["duration"], 8)
+
+    def test_command_bulk_callbacks(self):
+        """Test that the callbacks of a keyboard are inserted with a single query."""
+        registerwork_cmd = load_command_class(get_commands()["registerwork"], "registerwork", self.telegram_setting)
+        with self.assertNumQueries(1), registerwork_cmd.bulk_callbacks():
+            tokens = [registerwork_cmd.create_callback("selectworkedhours", "next_step", duration=i) for i in range(3)]
+        self.assertEqual(registerwork_cmd.get_callback_data(tokens[2])["duration"], 2)
+
     def test_prepare_item_batches(self):
         """Test the prepare item batches method."""
         commands = get_commands()
@@ -1,16 +1,37 @@
 """Generate invoice PDFs."""
 
 from dataclasses import dataclass, field
-from functools import partial
+from functools import lru_cache, partial
+from pathlib import Path
 
 from reportlab.lib.colors import HexColor
 from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen.canvas import Canvas
-from reportlab.platypus import Image, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 
 from pdf import IMAGES_FOLDER
 from pdf._reportlab import PDFDetails, SimpleDocTemplatePaddable
 
+GRAPHIC_ELEMENT_ALPHA = 255 // 6
+
+
+def _load_image(path: str, alpha: int | None = None):
+    """Return an image reader for the given path.
+
+    The reader is shared between the generated PDFs, so the image is only decoded once. The modification time of the
+    file is part of the cache key, so a replaced image is loaded again.
+    """
+    return _load_image_cached(path, Path(path).stat().st_mtime_ns, alpha)
+
+
+@lru_cache(maxsize=32)
+def _load_image_cached(path: str, mtime_ns: int, alpha: int | None):  # noqa: ARG001  # pylint: disable=unused-argument
+    image = ImageReader(path)
+    if alpha is not None:
+        image._image.putalpha(alpha)  # type: ignore[reportAttributeAccessIssue]
+    return image
+
 
 @dataclass
 class DetailsFrom:
@@ -199,11 +220,9 @@ class InvoicePDF:
         invoice = context.invoice
         styles = context.pdf.styles
 
-        graphic_element = Image(invoice.graphic_element)
-        graphic_element._img._image.putalpha(255 // 6)  # type: ignore[reportAttributeAccessIssue]
-        graphic_element.drawHeight = doc.width * graphic_element.drawHeight / graphic_element.drawWidth
-        graphic_element.drawWidth = doc.width
-        graphic_element.drawOn(canvas, 0, 0)
+        graphic_element = _load_image(invoice.graphic_element, alpha=GRAPHIC_ELEMENT_ALPHA)
+        width, height = graphic_element.getSize()
+        canvas.drawImage(graphic_element, 0, 0, doc.width, doc.width * height / width, mask="auto")
 
         from_paragraph = Paragraph(str(invoice.details_from), styles["normal"])
         _, h = from_paragraph.wrap(doc.width, doc.topMargin)
@@ -211,12 +230,13 @@ class InvoicePDF:
         y = doc.height + doc.topMargin - h
         from_paragraph.drawOn(canvas, x, y)
 
-        logo = Image(invoice.logo)
-        logo.drawHeight = 3 * inch * logo.drawHeight / logo.drawWidth
-        logo.drawWidth = 3 * inch
+        logo = _load_image(invoice.logo)
+        width, height = logo.getSize()
+        logo_width = 3 * inch
+        logo_height = logo_width * height / width
         x = doc.leftMargin
-        y = doc.height + doc.topMargin - logo.drawHeight
-        logo.drawOn(canvas, x, y)
+        y = doc.height + doc.topMargin - logo_height
+        canvas.drawImage(logo, x, y, logo_width, logo_height, mask="auto")
 
         to_paragraph = Paragraph(str(invoice.details_to), styles["bodytext"])
         _, h = to_paragraph.wrap(doc.width, doc.topMargin)